@@ -0,0 +1,247 @@
+"""
+Benchmarks for the weather refresh and river update hot paths, run against a local stub of the
+Google Weather and USGS APIs that replays the recorded fixtures.
+
+Times get_events_with_weather (cold and warm), save_10_day_location_forecast, the event
+normalization passes, fetch_new_data, store_river_history and the served CSV export over
+synthetic inputs of N tracks, M events and K years of river history, and reports seconds and
+peak traced memory per stage.
+
+Every data, cache and output path of both packages is redirected into a temporary directory,
+nothing in the repo or /var/www is touched. Peak memory comes from tracemalloc, which slows the
+traced code down, use --no-memory for timings without that overhead.
+
+Usage:
+    python benchmarks/run_benchmarks.py --tracks 50 --events 200 --river-years 2 --output results.json
+"""
+import os
+import sys
+import gc
+import json
+import types
+import logging
+import argparse
+import platform
+import tempfile
+import tracemalloc
+from time import perf_counter
+
+# Imports for running from the benchmarks folder
+benchmarks_dir = os.path.dirname(os.path.abspath(__file__))
+repo_root = os.path.abspath(os.path.join(benchmarks_dir, '..'))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from racing_weather_api import config
+from racing_weather_api.api import weather_api
+from racing_weather_api.api.forecast_frame import ForecastFrame
+from racing_weather_api.data_processing import event_processing
+from racing_weather_api.utils import conversion_utils
+from racing_weather_api.utils.http_client import close_sessions
+from wilson_ave_river_data_api import river_data_updater, river_history
+from stub_server import StubAPIServer
+from synthetic import make_tracks, make_schedule, make_events, make_river_history
+
+PACKAGES = ('racing_weather_api', 'wilson_ave_river_data_api')
+FORECAST_FIXTURE = os.path.join(repo_root, 'racing_weather_api', 'data', 'track_forecast.json')
+RDB_FIXTURE = os.path.join(repo_root, 'wilson_ave_river_data_api', 'data', 'river_level_data.rdb')
+WILSON_AVE_STATION_ID = river_data_updater.WILSON_AVE_STATION_ID
+
+logger = logging.getLogger(__name__)
+
+
+def redirect_paths(path_map):
+    """
+    Point every path under one of path_map's directories at its replacement: module constants,
+    path values in constant dicts, function argument defaults and the packages' cache/store objects.
+    """
+    def remap(value):
+        if not isinstance(value, str):
+            return value
+        for original, replacement in path_map.items():
+            if value == original or value.startswith(original + os.sep):
+                return replacement + value[len(original):]
+        return value
+
+    for module in list(sys.modules.values()):
+        if not getattr(module, '__name__', '').startswith(PACKAGES):
+            continue
+        for name, value in list(vars(module).items()):
+            if isinstance(value, str):
+                setattr(module, name, remap(value))
+            elif isinstance(value, dict) and name.isupper():
+                for key in value:
+                    value[key] = remap(value[key])
+            elif isinstance(value, types.FunctionType) and value.__defaults__:
+                value.__defaults__ = tuple(remap(default) for default in value.__defaults__)
+            elif type(value).__module__.startswith(PACKAGES) and hasattr(value, '__dict__'):
+                for attribute, attribute_value in list(vars(value).items()):
+                    setattr(value, attribute, remap(attribute_value))
+
+
+def disable_rate_limits():
+    """Lift the client-side rate limit and daily quota so stages measure the pipeline, not the throttle."""
+    weather_api.api_rate_limiter.rate = weather_api.api_rate_limiter.capacity = 1e9
+    weather_api.api_rate_limiter.tokens = 1e9
+    weather_api.api_quota.daily_limit = 10 ** 9
+
+
+def write_json(data, file_path):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, 'w') as f:
+        json.dump(data, f)
+
+
+def run_stage(results, name, func, trace_memory=True):
+    """Run func once, recording its wall time, peak traced memory and any counts it returns."""
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+    start = perf_counter()
+    try:
+        counts = func() or {}
+    finally:
+        seconds = perf_counter() - start
+        peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        if trace_memory:
+            tracemalloc.stop()
+
+    results[name] = {'seconds': round(seconds, 6), 'peak_memory_bytes': peak_memory, **counts}
+    print(f"{name:<34} {seconds:>10.4f}s"
+          + (f" {peak_memory / 2 ** 20:>10.2f} MiB" if peak_memory is not None else "")
+          + "".join(f"  {key}={value}" for key, value in counts.items()), flush=True)
+
+
+def benchmark_weather(results, stub, tracks, events, trace_memory):
+    """get_events_with_weather with an empty forecast store, then again with every forecast cached."""
+    write_json(tracks, config.TRACKS_FILE)
+    schedule_file = os.path.join(config.DATA_DIR, 'benchmark_schedule.json')
+    write_json(make_schedule(events, tracks), schedule_file)
+
+    def refresh():
+        stub.reset_calls()
+        processed = event_processing.get_events_with_weather(schedule_file=schedule_file, use_cached=False)
+        return {'events': len(processed), 'api_requests': stub.calls['weather']}
+
+    run_stage(results, 'get_events_with_weather (cold)', refresh, trace_memory)
+    run_stage(results, 'get_events_with_weather (warm)', refresh, trace_memory)
+
+    forecast = ForecastFrame.from_api({'forecastHours': stub.forecast_hours})
+
+    def save_forecasts():
+        weather_api.clear_forecast_cache()
+        for track in tracks:
+            weather_api.save_10_day_location_forecast(forecast, track['name'])
+        weather_api.publish_all_locations_forecast()
+        return {'tracks': len(tracks)}
+
+    run_stage(results, 'save_10_day_location_forecast', save_forecasts, trace_memory)
+
+
+def benchmark_normalization(results, tracks, events, trace_memory):
+    """normalize_event against the old copy-based normalize_text_case + normalize_wind_directions passes."""
+    records = make_events(events, tracks)
+    single_pass_input = [event.to_dict() for event in records]
+    two_pass_input = [event.to_dict() for event in records]
+    outputs = {}
+
+    def single_pass():
+        conversion_utils.normalize_text.cache_clear()
+        conversion_utils.normalize_wind_text.cache_clear()
+        outputs['single'] = [conversion_utils.normalize_event(event) for event in single_pass_input]
+        return {'events': len(records)}
+
+    def two_pass():
+        conversion_utils.normalize_text.cache_clear()
+        outputs['two_pass'] = conversion_utils.normalize_wind_directions(
+            conversion_utils.normalize_text_case(two_pass_input))
+        return {'events': len(records)}
+
+    run_stage(results, 'normalize_event', single_pass, trace_memory)
+    run_stage(results, 'normalize_text_case + wind (old)', two_pass, trace_memory)
+    results['normalize_event']['matches_two_pass'] = outputs['single'] == outputs['two_pass']
+
+
+def benchmark_river(results, stub, sites, river_years, trace_memory):
+    """fetch_new_data for a batch of sites, then storing and exporting onto K years of river history."""
+    station_ids = [WILSON_AVE_STATION_ID] + [f"{4119100 + i:08d}" for i in range(sites - 1)]
+    fetched = {}
+
+    def fetch():
+        stub.reset_calls()
+        fetched.update(river_data_updater.fetch_new_data(station_ids))
+        return {'sites': len(station_ids), 'api_requests': stub.calls['usgs'],
+                'readings': sum(len(site_df) for site_df in fetched.values())}
+
+    run_stage(results, 'fetch_new_data', fetch, trace_memory)
+
+    # Served CSV with K years of history ending now, so the fetched readings revise its tail
+    csv_file = river_data_updater.SERVED_CSV_FILES[WILSON_AVE_STATION_ID]
+    new_df = fetched[WILSON_AVE_STATION_ID]
+    history = make_river_history(river_years, WILSON_AVE_STATION_ID, new_df.columns[-1],
+                                 end=new_df['datetime'].min())
+    os.makedirs(os.path.dirname(csv_file), exist_ok=True)
+    history.to_csv(csv_file, index=False)
+
+    # The first update imports the served CSV into the history, later runs only touch recent months
+    run_stage(results, 'import_served_csv_history',
+              lambda: {'csv_rows': river_history.import_csv_history(csv_file)}, trace_memory)
+    run_stage(results, 'store_river_history',
+              lambda: {'new_readings': len(new_df), 'stored': river_data_updater.store_river_history(new_df)},
+              trace_memory)
+    run_stage(results, 'update_river_csv',
+              lambda: {'rows_exported': river_history.update_river_csv(WILSON_AVE_STATION_ID, csv_file,
+                                                                      new_df['datetime'].min())},
+              trace_memory)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--tracks', type=int, default=20, help='Number of synthetic tracks (N)')
+    parser.add_argument('--events', type=int, default=100, help='Number of synthetic scheduled events (M)')
+    parser.add_argument('--river-years', type=float, default=1, help='Years of 15 minute river history in the served CSV (K)')
+    parser.add_argument('--river-sites', type=int, default=10, help='Number of USGS sites to fetch')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--no-memory', action='store_true', help='Skip tracemalloc peak memory tracking')
+    parser.add_argument('--rate-limit', action='store_true', help='Keep the configured API rate limit and daily quota')
+    parser.add_argument('--log-level', default='WARNING', help='Log level for the benchmarked code')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=getattr(logging, args.log_level.upper()), force=True)
+    os.environ.setdefault('MAPSAPI_KEY', 'benchmark')
+    trace_memory = not args.no_memory
+
+    with tempfile.TemporaryDirectory(prefix='racing_weather_benchmarks_') as work_dir:
+        redirect_paths({
+            config.DATA_DIR: os.path.join(work_dir, 'racing_weather_api'),
+            config.DATA_OUTPUT_DIR: os.path.join(work_dir, 'www'),
+            os.path.join(river_data_updater.BASE_DIR, 'data'): os.path.join(work_dir, 'wilson_ave_river_data_api'),
+        })
+        if not args.rate_limit:
+            disable_rate_limits()
+
+        tracks = make_tracks(args.tracks)
+        results = {}
+        with StubAPIServer(FORECAST_FIXTURE, RDB_FIXTURE) as stub:
+            weather_api.MAPSAPI_BASE_URL = stub.weather_url
+            river_data_updater.USGS_BASE_URL = stub.usgs_url
+
+            benchmark_weather(results, stub, tracks, args.events, trace_memory)
+            benchmark_normalization(results, tracks, args.events, trace_memory)
+            benchmark_river(results, stub, args.river_sites, args.river_years, trace_memory)
+            close_sessions()
+
+    report = {
+        'params': {'tracks': args.tracks, 'events': args.events, 'river_years': args.river_years,
+                   'river_sites': args.river_sites, 'memory_traced': trace_memory, 'rate_limited': args.rate_limit},
+        'python': platform.python_version(),
+        'stages': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+Local stub of the Google Weather and USGS NWIS APIs that replays recorded responses.
+
+Google Weather requests are answered with the recorded track_forecast.json, shifted to start
+at the current hour and split into 24-hour pages chained by nextPageToken, like the live API.
+USGS requests are answered with RDB bodies in the layout of river_level_data.rdb, one block
+per requested site with a reading every 15 minutes for the requested window.
+"""
+import copy
+import json
+import threading
+import urllib.parse
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from zoneinfo import ZoneInfo
+
+FORECAST_PAGE_SIZE = 24
+READING_INTERVAL = timedelta(minutes=15)
+
+
+def load_forecast_hours(forecast_fixture, display_timezone='America/New_York'):
+    """Recorded forecast hours moved to start at the current UTC hour, display times in the track's time zone."""
+    with open(forecast_fixture, 'r') as f:
+        recorded_hours = json.load(f)['forecastHours']
+
+    first_hour = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    local_zone = ZoneInfo(display_timezone)
+    forecast_hours = []
+    for i, recorded_hour in enumerate(recorded_hours):
+        forecast_hour = copy.deepcopy(recorded_hour)
+        start_time = first_hour + timedelta(hours=i)
+        forecast_hour['interval'] = {
+            'startTime': start_time.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'endTime': (start_time + timedelta(hours=1)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        }
+        local_time = start_time.astimezone(local_zone)
+        forecast_hour.setdefault('displayDateTime', {}).update(
+            year=local_time.year, month=local_time.month, day=local_time.day, hours=local_time.hour)
+        forecast_hours.append(forecast_hour)
+    return forecast_hours
+
+
+def load_rdb_template(rdb_fixture):
+    """Column names and the recorded level values of an RDB fixture, levels are replayed in a loop."""
+    header, levels = None, []
+    with open(rdb_fixture, 'r') as f:
+        for line in f:
+            fields = line.rstrip('\n').split('\t')
+            if line.startswith('#') or len(fields) < 6:
+                continue
+            if fields[0] == 'agency_cd':
+                header = fields
+            elif fields[0] == 'USGS':
+                levels.append(fields[4])
+    return header, levels or ['4.65']
+
+
+class StubAPIServer:
+    """Threaded local HTTP server answering both APIs, use as a context manager."""
+
+    def __init__(self, forecast_fixture, rdb_fixture):
+        self.forecast_hours = load_forecast_hours(forecast_fixture)
+        self.rdb_header, self.rdb_levels = load_rdb_template(rdb_fixture)
+        self.calls = {'weather': 0, 'usgs': 0}
+        self._calls_lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    @property
+    def weather_url(self):
+        return f"{self.base_url}/v1/forecast/hours:lookup"
+
+    @property
+    def usgs_url(self):
+        return f"{self.base_url}/nwis/iv/"
+
+    def reset_calls(self):
+        with self._calls_lock:
+            self.calls = {'weather': 0, 'usgs': 0}
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _count(self, api):
+        with self._calls_lock:
+            self.calls[api] += 1
+
+    def weather_page(self, query):
+        """One page of the forecast, pageToken is the offset of the first hour."""
+        offset = int(query.get('pageToken', ['0'])[0])
+        page = {'forecastHours': self.forecast_hours[offset:offset + FORECAST_PAGE_SIZE]}
+        if offset + FORECAST_PAGE_SIZE < len(self.forecast_hours):
+            page['nextPageToken'] = str(offset + FORECAST_PAGE_SIZE)
+        return json.dumps(page).encode('utf-8')
+
+    def usgs_body(self, query):
+        """RDB body with a block of readings per requested site, times are naive station-local like the live API."""
+        sites = query['sites'][0].split(',')
+        start_time = datetime.fromisoformat(query['startDT'][0]).replace(tzinfo=None)
+        end_time = datetime.fromisoformat(query['endDT'][0]).replace(tzinfo=None) if 'endDT' in query else datetime.now()
+
+        # Readings fall on 15 minute marks
+        first_reading = start_time.replace(second=0, microsecond=0)
+        first_reading += timedelta(minutes=-first_reading.minute % 15)
+        reading_times = []
+        reading_time = first_reading
+        while reading_time <= end_time:
+            reading_times.append(reading_time.strftime('%Y-%m-%d %H:%M'))
+            reading_time += READING_INTERVAL
+
+        lines = ['# Stub USGS instantaneous values']
+        for site in sites:
+            lines.append('\t'.join(self.rdb_header))
+            lines.append('5s\t15s\t20d\t6s\t14n\t10s')
+            lines.extend(f"USGS\t{site}\t{time_str}\tEDT\t{self.rdb_levels[i % len(self.rdb_levels)]}\tP"
+                         for i, time_str in enumerate(reading_times))
+        return ('\n'.join(lines) + '\n').encode('utf-8')
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urllib.parse.urlsplit(self.path)
+                query = urllib.parse.parse_qs(url.query)
+                if url.path.startswith('/v1/forecast'):
+                    stub._count('weather')
+                    body, content_type = stub.weather_page(query), 'application/json'
+                elif url.path.startswith('/nwis'):
+                    stub._count('usgs')
+                    body, content_type = stub.usgs_body(query), 'text/plain'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        return Handler
@@ -0,0 +1,88 @@
+"""
+Scalable synthetic inputs for the benchmarks: N tracks, M scheduled events and K years of river history.
+
+Everything is generated from a seeded random.Random so runs with the same sizes are comparable.
+"""
+import random
+from datetime import datetime, timedelta
+import pandas as pd
+from racing_weather_api.config import ENABLED_SERIES
+from racing_weather_api.data_processing.models import Event, EventWeather, HourlyForecast, Track
+from racing_weather_api.utils.time_utils import get_timezone
+
+EVENT_TIMES = ('12 PM', '1:30 PM', '3 PM', '7 PM', '8:30 PM')
+CHANNELS = ('FOX', 'FS1', 'NBC', 'USA', 'CW', 'PRIME')
+CONDITIONS = ('CLEAR', 'MOSTLY_CLOUDY', 'PARTLY_CLOUDY', 'LIGHT_RAIN', 'THUNDERSTORM')
+WIND_DIRECTIONS = ('NORTH', 'NORTH_NORTHWEST', 'SOUTHWEST', 'EAST_SOUTHEAST', 'WEST')
+RIVER_READING_INTERVAL = timedelta(minutes=15)
+
+
+def make_tracks(count, seed=0):
+    """Track entries in the tracks.json layout, each in its own forecast grid cell across the continental US."""
+    rng = random.Random(seed)
+    return [{
+        'name': f"TRACK {i:04d}",
+        'location': f"City {i:04d}, ST",
+        'latitude': round(rng.uniform(25.0, 48.0), 7),
+        'longitude': round(rng.uniform(-123.0, -70.0), 7),
+        'trackName': f"Track {i:04d} Speedway",
+    } for i in range(count)]
+
+
+def make_schedule(count, tracks, seed=0):
+    """Schedule entries spread over the next 6 days (Eastern), cycling through the tracks, series and start times."""
+    rng = random.Random(seed)
+    today = datetime.now(get_timezone()).date()
+    series = ENABLED_SERIES or ['NASCAR CUP SERIES']
+    schedule = []
+    for i in range(count):
+        event_date = today + timedelta(days=1 + i % 6)
+        schedule.append({
+            'Series': series[i % len(series)],
+            'location': tracks[i % len(tracks)]['name'],
+            'day_of_week': event_date.strftime('%a').upper(),
+            'date': event_date.strftime('%Y-%m-%d'),
+            'time': rng.choice(EVENT_TIMES),
+            'channel': rng.choice(CHANNELS),
+        })
+    return schedule
+
+
+def make_events(count, tracks, seed=0):
+    """Assembled Event records with a 5 hour forecast each, in the state they are in just before normalization."""
+    rng = random.Random(seed)
+    events = []
+    for event_data, track_data in zip(make_schedule(count, tracks, seed), (tracks[i % len(tracks)] for i in range(count))):
+        event = Event.from_dict(event_data)
+        event.start_time_utc = f"{event.date}T18:00:00Z"
+        event.track = Track.from_dict(track_data)
+        hourly_forecast = [HourlyForecast(
+            time=f"{hour}:00 PM",
+            temperature=round(rng.uniform(50, 95), 1),
+            feels_like=round(rng.uniform(50, 95), 1),
+            condition=rng.choice(CONDITIONS),
+            precipitation_type='RAIN',
+            precipitation_prob=rng.randrange(0, 100, 5),
+            wind_speed=round(rng.uniform(0, 20), 1),
+            wind_speed_direction=rng.choice(WIND_DIRECTIONS),
+        ) for hour in range(1, 6)]
+        event.weather = EventWeather(hourly_forecast, daily_high=95.0, daily_low=60.0)
+        events.append(event)
+    return events
+
+
+def make_river_history(years, site_no, qualifier_column, end=None, seed=0):
+    """K years of 15 minute readings for one site in the served CSV layout, ending at the last 15 minute mark before end."""
+    rng = random.Random(seed)
+    end = end or datetime.now()
+    end = end.replace(minute=end.minute - end.minute % 15, second=0, microsecond=0)
+    reading_times = pd.date_range(end=end, periods=int(years * 365 * 24 * 4), freq=RIVER_READING_INTERVAL)
+    levels = [round(4.0 + rng.random(), 2) for _ in range(len(reading_times))]
+    return pd.DataFrame({
+        'agency_cd': 'USGS',
+        'site_no': site_no,
+        'datetime': reading_times,
+        'tz_cd': 'EDT',
+        'level': levels,
+        qualifier_column: 'A',
+    })
@@ -1,6 +1,7 @@
 import logging
 from racing_weather_api.config import LOG_FILE, LOG_LEVEL, LOG_FORMAT
 from racing_weather_api.data_processing.event_processing import get_events_with_weather
+from racing_weather_api.utils.http_client import close_sessions
 
 # Configure logging
 logging.basicConfig(
@@ -26,3 +27,6 @@ try:
 except Exception as e:
     logger.error(f"Error in scheduled job: {str(e)}")
 
+finally:
+    close_sessions()
+
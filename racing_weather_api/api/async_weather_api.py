@@ -0,0 +1,183 @@
+"""
+Module for the asyncio Google Weather API fetch path.
+
+Page chains are sequential per location (each page needs the previous nextPageToken), so
+locations are downloaded concurrently on one event loop instead of on worker threads.
+Caching, storage and the all 10 day forecasts file are shared with weather_api, their disk I/O
+and the forecast parsing run in worker threads so they never stall the other page chains.
+"""
+import asyncio
+import json
+import logging
+import time
+import types
+import urllib.parse
+import aiohttp
+from racing_weather_api.config import FORECAST_FETCH_MAX_WORKERS, RAW_FORECAST_ARCHIVE_ENABLED
+from racing_weather_api.utils.http_client import get_async_session
+from racing_weather_api.api.weather_api import (RETRYABLE_STATUS_CODES, api_retry, get_api_key, get_forecast_key,
+                                               get_cached_location_forecast, get_prefetched_forecast,
+                                               cache_downloaded_forecast, build_weather_api_url, archive_raw_forecast,
+                                               group_locations_by_cell, log_prefetch_results, validator_cache,
+                                               budget_forecast_downloads, skip_forecast_download, is_download_skipped,
+                                               expected_forecast_requests, api_quota, api_rate_limiter, record_forecast_download, record_api_response,
+                                               request_counter, read_request_counts)
+from racing_weather_api.utils.rate_limiter import QuotaExceededError
+
+logger = logging.getLogger(__name__)
+
+
+class RetryableStatusError(Exception):
+    """Raised for rate limiting and server error responses so the retry policy picks them up."""
+
+
+async def prefetch_location_forecasts_async(locations, max_concurrency=FORECAST_FETCH_MAX_WORKERS):
+    """Download forecasts for all distinct locations concurrently, returns once every fetch has finished.
+
+    Locations should be ordered soonest event first, that order decides who gets the quota when it runs low.
+    """
+    unique_locations, locations_by_cell = group_locations_by_cell(locations)
+    if not unique_locations:
+        return {}
+    representatives = budget_forecast_downloads(locations_by_cell)
+
+    logger.info(f"Fetching forecasts for {len(representatives)} forecast cells, {max_concurrency} at a time")
+    semaphore = asyncio.Semaphore(max(1, max_concurrency))
+    session = get_async_session()
+    await asyncio.gather(*(get_location_forecast_async(session, semaphore, location)
+                           for location in representatives))
+
+    # Remaining locations in each cell are served from the shared cached forecast, never downloaded here
+    results = {location: get_prefetched_forecast(location) for location in unique_locations}
+    log_prefetch_results(results, locations_by_cell)
+    return results
+
+
+async def get_location_forecast_async(session, semaphore, location: str):
+    """Async counterpart of get_location_forecast, only the download itself waits on the semaphore."""
+    forecast_key = get_forecast_key(location)
+    if not forecast_key:
+        logger.error(f"Error getting forecast for {location}: track not found in the data")
+        return None
+
+    cached_forecast = await asyncio.to_thread(get_cached_location_forecast, forecast_key, location)
+    if cached_forecast is not None:
+        return cached_forecast
+    if is_download_skipped(forecast_key):
+        return None
+
+    try:
+        # Access the API key
+        api_key = get_api_key()
+        if not api_key:
+            logger.warning("Warning: MAPSAPI_KEY environment variable not set. Please check your .env file.")
+            return None
+
+        # Build weather URL
+        weather_url = build_weather_api_url(location, api_key)
+
+        async with semaphore:
+            logger.info(f"Downloading data from Google Weather API for {location}...")
+            download_start = time.perf_counter()
+            # Reserve the whole page chain first, so the quota never cuts a download off halfway
+            reservation = await asyncio.to_thread(api_quota.reserve, expected_forecast_requests())
+            try:
+                forecast_data, counter = await download_maps_api_data_async(session, weather_url,
+                                                                            archive_name=location,
+                                                                            reservation=reservation)
+            finally:
+                await asyncio.to_thread(reservation.close)
+            request_count, body_bytes, retries = read_request_counts(counter)
+            record_forecast_download(location, time.perf_counter() - download_start, request_count, body_bytes, retries)
+
+        forecast = await asyncio.to_thread(cache_downloaded_forecast, forecast_key, location, forecast_data, request_count)
+        logger.info(f"Downloaded and cached forecast for {location}")
+
+        return forecast
+    except QuotaExceededError as e:
+        logger.error(f"Error getting forecast for {location}: {e}")
+        return await asyncio.to_thread(skip_forecast_download, location)
+    except Exception as e:
+        logger.error(f"Error getting forecast for {location}: {e}")
+        return None
+
+
+async def download_maps_api_data_async(session, maps_api_url, archive_name=None, reservation=None):
+    '''Fetches every page of a weather forecast, returns the combined response and its request counter.
+
+    The counter holds this download's requests, response bytes and retries, locations share the event
+    loop's thread so the thread-local request_counter can't tell them apart. Requests are taken from
+    reservation if given, otherwise from the daily quota one page at a time.
+    '''
+    all_forecast_data = {
+        "forecastHours": []
+    }
+    counter = types.SimpleNamespace(count=0, bytes=0, retries=0)
+
+    next_url = maps_api_url
+
+    # Loop through paginated results
+    while next_url:
+        try:
+            data = await make_api_request_async(session, next_url, reservation, counter=counter)
+
+            # Append current page's forecast data
+            all_forecast_data["forecastHours"].extend(data.get("forecastHours", []))
+
+            # Check for next page
+            next_page_token = data.get("nextPageToken")
+            if next_page_token:
+                # Add pageToken to the base URL
+                next_url = f"{maps_api_url}&pageToken={urllib.parse.quote(next_page_token)}"
+            else:
+                next_url = None  # Done
+
+        except Exception as e:
+            logger.error(f"Failed to download API data: {e}")
+            raise
+
+    # Raw responses are only kept for debugging, production skips this I/O entirely
+    if RAW_FORECAST_ARCHIVE_ENABLED and archive_name:
+        await asyncio.to_thread(archive_raw_forecast, all_forecast_data, archive_name)
+
+    return all_forecast_data, counter
+
+
+# Same retry/backoff policy as make_api_request
+@api_retry(
+    aiohttp.ClientError,
+    asyncio.TimeoutError,
+    RetryableStatusError
+)
+async def make_api_request_async(session, url, reservation=None, counter=request_counter):
+    """Make a conditional API request with retry logic using tenacity, returns the decoded JSON page.
+
+    Requests, response bytes and retries are added to counter, pass it by keyword so retries are counted too.
+    """
+    # Same quota and rate limit as make_api_request, the quota and validator cache are file backed
+    await asyncio.to_thread(reservation.take if reservation is not None else api_quota.consume)
+    await api_rate_limiter.acquire_async()
+    counter.count = getattr(counter, 'count', 0) + 1
+    headers = await asyncio.to_thread(validator_cache.request_headers, url)
+    request_start = time.perf_counter()
+    async with session.get(url, headers=headers) as response:
+        body = await response.read()
+        record_api_response(response.status, time.perf_counter() - request_start, len(body), counter)
+
+        # Unchanged since the last download, answer from the saved copy
+        if response.status == 304:
+            body = await asyncio.to_thread(validator_cache.not_modified_body, url)
+            if body is not None:
+                return json.loads(body)
+            raise RetryableStatusError("Saved response for a 304 is missing")
+
+        # Retry on server errors and rate limiting
+        if response.status in RETRYABLE_STATUS_CODES:
+            raise RetryableStatusError(f"API request failed with status code {response.status}")
+        elif response.status != 200:
+            # Don't retry on client errors (4xx except 429)
+            logger.error(f"API request failed with non-retryable status code {response.status}")
+            raise Exception(f"API request failed with status code {response.status}")
+
+        await asyncio.to_thread(validator_cache.store_response, url, response.headers, body)
+        return json.loads(body)
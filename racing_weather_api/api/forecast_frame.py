@@ -0,0 +1,186 @@
+"""
+Module for the columnar, NumPy-backed representation of a downloaded forecast.
+"""
+import logging
+from datetime import date, datetime
+import numpy as np
+from racing_weather_api.data_processing.models import HourlyForecast
+
+logger = logging.getLogger(__name__)
+
+# Categorical columns, stored as integer codes into a per-frame list of categories
+CATEGORICAL_COLUMNS = ('condition', 'precipitation_type', 'wind_direction')
+
+# Numeric columns, missing values are stored as NaN
+NUMERIC_COLUMNS = ('temperature_c', 'feels_like_c', 'precipitation_percent', 'wind_speed_kph')
+
+MISSING_CODE = -1
+
+
+class ForecastFrame:
+    """Forecast hours stored as time-sorted column arrays, with units converted and daily highs/lows precomputed."""
+
+    def __init__(self, epochs, local_days, columns, categories):
+        order = np.argsort(epochs, kind='stable')
+        self.epochs = np.asarray(epochs, dtype=np.int64)[order]
+        self.local_days = np.asarray(local_days, dtype=np.int32)[order]
+        self.columns = {name: np.asarray(columns[name], dtype=np.float64)[order] for name in NUMERIC_COLUMNS}
+        self.codes = {name: np.asarray(columns[name], dtype=np.int16)[order] for name in CATEGORICAL_COLUMNS}
+        self.categories = {name: list(categories[name]) for name in CATEGORICAL_COLUMNS}
+
+        # Vectorized unit conversion, rounded to one decimal like celsius_to_fahrenheit and kph_to_mph
+        self.temperature_f = np.round(self.columns['temperature_c'] * 9 / 5 + 32, 1)
+        self.feels_like_f = np.round(self.columns['feels_like_c'] * 9 / 5 + 32, 1)
+        self.wind_speed_mph = np.round(self.columns['wind_speed_kph'] * 0.621371, 1)
+
+        # Daily high/low per local day, hours of a day are contiguous once sorted by time
+        self.daily_temps = {}
+        if len(self.epochs):
+            day_starts = np.flatnonzero(np.r_[True, self.local_days[1:] != self.local_days[:-1]])
+            with np.errstate(invalid='ignore'):
+                highs = np.fmax.reduceat(self.temperature_f, day_starts)
+                lows = np.fmin.reduceat(self.temperature_f, day_starts)
+            for day, high, low in zip(self.local_days[day_starts].tolist(), highs.tolist(), lows.tolist()):
+                if day != MISSING_CODE and not np.isnan(high):
+                    self.daily_temps[day] = {'high': high, 'low': low}
+
+    @classmethod
+    def from_api(cls, forecast_data):
+        """Build a frame from a Google Weather API response, keeping only the fields we use."""
+        epochs, local_days = [], []
+        columns = {name: [] for name in NUMERIC_COLUMNS + CATEGORICAL_COLUMNS}
+        category_codes = {name: {} for name in CATEGORICAL_COLUMNS}
+
+        for forecast_hour in forecast_data.get('forecastHours', []):
+            # Parse UTC timestamp: "2025-06-27T18:00:00Z"
+            start_time = forecast_hour.get('interval', {}).get('startTime', '')
+            try:
+                epoch = int(datetime.fromisoformat(start_time.replace('Z', '+00:00')).timestamp())
+            except ValueError:
+                logger.warning(f"Skipping forecast hour with invalid start time '{start_time}'")
+                continue
+            epochs.append(epoch)
+            local_days.append(_local_day(forecast_hour))
+
+            precipitation = forecast_hour.get('precipitation', {}).get('probability', {})
+            wind = forecast_hour.get('wind', {})
+            columns['temperature_c'].append(_number(forecast_hour.get('temperature', {}).get('degrees')))
+            columns['feels_like_c'].append(_number(forecast_hour.get('feelsLikeTemperature', {}).get('degrees')))
+            columns['precipitation_percent'].append(_number(precipitation.get('percent')))
+            columns['wind_speed_kph'].append(_number(wind.get('speed', {}).get('value')))
+
+            values = {
+                'condition': forecast_hour.get('weatherCondition', {}).get('description', {}).get('text'),
+                'precipitation_type': precipitation.get('type'),
+                'wind_direction': wind.get('direction', {}).get('cardinal'),
+            }
+            for name, value in values.items():
+                if value is None:
+                    columns[name].append(MISSING_CODE)
+                else:
+                    columns[name].append(category_codes[name].setdefault(value, len(category_codes[name])))
+
+        categories = {name: list(codes) for name, codes in category_codes.items()}
+        return cls(epochs, local_days, columns, categories)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a frame from to_dict output, or from a raw API response stored by older versions."""
+        if 'forecastHours' in data:
+            return cls.from_api(data)
+        columns = {name: [np.nan if value is None else value for value in data[name]] for name in NUMERIC_COLUMNS}
+        columns.update({name: data[name] for name in CATEGORICAL_COLUMNS})
+        return cls(data['epochs'], data['local_days'], columns, data['categories'])
+
+    def to_dict(self):
+        """Compact JSON-serializable form of the frame, used by the persistent forecast store."""
+        data = {
+            'epochs': self.epochs.tolist(),
+            'local_days': self.local_days.tolist(),
+            'categories': self.categories,
+        }
+        for name in NUMERIC_COLUMNS:
+            data[name] = [None if np.isnan(value) else value for value in self.columns[name].tolist()]
+        for name in CATEGORICAL_COLUMNS:
+            data[name] = self.codes[name].tolist()
+        return data
+
+    def __len__(self):
+        return len(self.epochs)
+
+    def window_slice(self, start_epoch, end_epoch):
+        """Slice of the hours starting within [start_epoch, end_epoch], found by binary search."""
+        start = int(np.searchsorted(self.epochs, start_epoch, side='left'))
+        end = int(np.searchsorted(self.epochs, end_epoch, side='right'))
+        return slice(start, end)
+
+    def hourly_forecasts(self, hours=slice(None)):
+        """HourlyForecast records for the selected hours, in display units."""
+        conditions = self._labels('condition', hours)
+        precipitation_types = self._labels('precipitation_type', hours)
+        wind_directions = self._labels('wind_direction', hours)
+        return [
+            HourlyForecast(
+                time=time_str,
+                temperature=_value(temperature),
+                feels_like=_value(feels_like),
+                condition=condition,
+                precipitation_type=precipitation_type,
+                precipitation_prob=_value(precipitation_percent, integral=True),
+                wind_speed=_value(wind_speed),
+                wind_speed_direction=wind_direction
+            )
+            for time_str, temperature, feels_like, condition, precipitation_type, precipitation_percent,
+                wind_speed, wind_direction in zip(
+                self._time_strings(hours), self.temperature_f[hours].tolist(), self.feels_like_f[hours].tolist(),
+                conditions, precipitation_types, self.columns['precipitation_percent'][hours].tolist(),
+                self.wind_speed_mph[hours].tolist(), wind_directions
+            )
+        ]
+
+    def ten_day_hours(self):
+        """Hourly temperature/precipitation rows in the all 10 day forecasts output shape."""
+        # Missing values fall back to 0 like the original per-hour dict lookups
+        temperatures = np.where(np.isnan(self.temperature_f), 32.0, self.temperature_f).tolist()
+        precipitation = np.nan_to_num(self.columns['precipitation_percent']).astype(np.int64).tolist()
+        return [
+            {"time": time_str, "tempFahrenheit": temperature, "precipitationPercent": percent}
+            for time_str, temperature, percent in zip(self._time_strings(), temperatures, precipitation)
+        ]
+
+    def daily_high_low(self, local_date: date):
+        """Return the high/low temperature for a local day, or N/A if the forecast does not cover it."""
+        return self.daily_temps.get(local_date.toordinal(), {'high': 'N/A', 'low': 'N/A'})
+
+    def _time_strings(self, hours=slice(None)):
+        # Format as the API does: "2025-06-27T18:00:00Z"
+        return np.datetime_as_string(self.epochs[hours].astype('datetime64[s]'), unit='s').astype(object) + 'Z'
+
+    def _labels(self, name, hours):
+        # MISSING_CODE (-1) indexes the trailing N/A label
+        labels = np.array(self.categories[name] + ['N/A'], dtype=object)
+        return labels[self.codes[name][hours]].tolist()
+
+
+def _local_day(forecast_hour):
+    """Local calendar day ordinal of a forecast hour from its displayDateTime, MISSING_CODE if missing."""
+    display_time = forecast_hour.get('displayDateTime', {})
+    try:
+        return date(display_time['year'], display_time['month'], display_time['day']).toordinal()
+    except (KeyError, TypeError, ValueError):
+        return MISSING_CODE
+
+
+def _number(value):
+    """Float value of a numeric API field, NaN if missing or not numeric."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def _value(value, integral=False):
+    """Convert a NaN to the N/A placeholder used in the output files."""
+    if np.isnan(value):
+        return 'N/A'
+    return int(value) if integral and value.is_integer() else value
@@ -0,0 +1,137 @@
+"""
+Module for the persistent on-disk forecast store, shared between runs so fresh forecasts are not re-downloaded.
+"""
+import json
+import os
+import re
+import time
+import hashlib
+import logging
+import threading
+from racing_weather_api.config import FORECAST_CACHE_DIR, FORECAST_CACHE_TTL_MINUTES, FORECAST_CACHE_MAX_ENTRIES
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE_NAME = 'index.json'
+
+
+class ForecastStore:
+    """Forecast store keyed by track, each entry records its fetch time for TTL checks and last access for LRU eviction."""
+
+    def __init__(self, cache_dir=FORECAST_CACHE_DIR, ttl_minutes=FORECAST_CACHE_TTL_MINUTES,
+                 max_entries=FORECAST_CACHE_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_minutes * 60
+        self.max_entries = max_entries
+        self._index = None
+        self._lock = threading.Lock()
+
+    @property
+    def index_file(self):
+        return os.path.join(self.cache_dir, INDEX_FILE_NAME)
+
+    def get(self, key, allow_stale=False):
+        """Return the stored forecast for key, or None if missing or older than the TTL."""
+        with self._lock:
+            index = self._load_index()
+            entry = index.get(key)
+            if not entry:
+                return None
+
+            age = time.time() - entry['fetched_at']
+            if age > self.ttl_seconds and not allow_stale:
+                logger.info(f"Stored forecast for {key} is stale ({age / 60:.0f} min old)")
+                return None
+
+            try:
+                with open(os.path.join(self.cache_dir, entry['file']), 'r') as f:
+                    data = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError) as e:
+                logger.warning(f"Dropping unreadable stored forecast for {key}: {e}")
+                index.pop(key, None)
+                self._save_index()
+                return None
+
+            entry['last_access'] = time.time()
+            self._save_index()
+            return data
+
+    def is_fresh(self, key):
+        """Return True if a forecast for key is stored and younger than the TTL, without reading it."""
+        fetched_at = self.fetched_at(key)
+        return fetched_at is not None and time.time() - fetched_at <= self.ttl_seconds
+
+    def fetched_at(self, key):
+        """Return the epoch time the stored forecast for key was downloaded, or None if not stored."""
+        with self._lock:
+            entry = self._load_index().get(key)
+            return entry['fetched_at'] if entry else None
+
+    def put(self, key, data):
+        """Store a freshly downloaded forecast for key and evict old entries if over the size limit."""
+        with self._lock:
+            index = self._load_index()
+            file_name = self._file_name(key)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._write_file(os.path.join(self.cache_dir, file_name), data)
+
+            now = time.time()
+            index[key] = {'file': file_name, 'fetched_at': now, 'last_access': now}
+            self._evict()
+            self._save_index()
+
+    def clear(self):
+        """Remove every stored forecast."""
+        with self._lock:
+            index = self._load_index()
+            for key in list(index):
+                self._remove(key)
+            self._save_index()
+
+    def _evict(self):
+        """Drop least recently used entries until the store is within max_entries."""
+        index = self._index
+        overflow = len(index) - self.max_entries
+        if overflow <= 0:
+            return
+
+        lru_keys = sorted(index, key=lambda k: index[k]['last_access'])[:overflow]
+        for key in lru_keys:
+            self._remove(key)
+        logger.info(f"Evicted {len(lru_keys)} least recently used forecasts from store")
+
+    def _remove(self, key):
+        entry = self._index.pop(key, None)
+        if entry:
+            try:
+                os.remove(os.path.join(self.cache_dir, entry['file']))
+            except FileNotFoundError:
+                pass
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self.index_file, 'r') as f:
+                    self._index = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._write_file(self.index_file, self._index)
+
+    @staticmethod
+    def _file_name(key):
+        # Readable prefix plus a short hash so different keys never collide on disk
+        slug = re.sub(r'[^A-Za-z0-9]+', '_', key).strip('_').lower()
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]
+        return f"{slug}_{digest}.json"
+
+    @staticmethod
+    def _write_file(file_path, data):
+        # Write to a temp file and rename so a crash never leaves a half-written entry
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, file_path)
@@ -1,56 +1,110 @@
 """
 Module for handling weather API operations and data fetching.
 """
+import gzip
 import json
+import re
 import urllib.parse
 import requests
 import os
 import logging
+import threading
+import time
 from datetime import datetime, timedelta, timezone
 from dotenv import load_dotenv
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type, before_sleep_log
-from racing_weather_api.config import (TRACKS_FILE, TRACK_FORECAST_FILE, MAPSAPI_BASE_URL, ALL_LOCATIONS_FORECAST_FILE,
-                                       API_TIMEOUT, FORECAST_HOURS_BEFORE_EVENT, FORECAST_HOURS_AFTER_EVENT)
-from racing_weather_api.utils.conversion_utils import celsius_to_fahrenheit, kph_to_mph, parse_event_time, convert_est_to_utc
+from racing_weather_api.config import (TRACKS_FILE, MAPSAPI_BASE_URL, ALL_LOCATIONS_FORECAST_FILE,
+                                       API_TIMEOUT, FORECAST_HOURS_BEFORE_EVENT, FORECAST_HOURS_AFTER_EVENT,
+                                       PUBLISHED_FILE_COMPRESSION,
+                                       RAW_FORECAST_ARCHIVE_ENABLED, RAW_FORECAST_ARCHIVE_DIR, RAW_FORECAST_ARCHIVE_KEEP,
+                                       FORECAST_CACHE_TTL_MINUTES, API_RATE_LIMIT_PER_SECOND, API_RATE_LIMIT_BURST,
+                                       API_DAILY_QUOTA, API_QUOTA_RESET_TIMEZONE, API_QUOTA_STATE_FILE,
+                                       API_PAGES_PER_FORECAST, METRICS_TEXTFILE_DIR, WEATHER_RUN_SUMMARY_FILE)
+from racing_weather_api.utils.file_utils import publish_json
+from racing_weather_api.utils.http_client import get_session
+from racing_weather_api.utils.http_cache import ValidatorCache
+from racing_weather_api.utils.metrics import RunMetrics
+from racing_weather_api.utils.rate_limiter import TokenBucket, QuotaBudget, QuotaExceededError
+from racing_weather_api.utils.time_utils import local_to_utc_epoch, parse_local_datetime, utc_datetime
+from racing_weather_api.api.forecast_store import ForecastStore
+from racing_weather_api.api.forecast_frame import ForecastFrame
+from racing_weather_api.data_processing.models import Event, EventWeather
+from racing_weather_api.data_processing.track_registry import get_track_registry, coordinate_key, round_coordinates
 
 logger = logging.getLogger(__name__)
 
-# Cache to store forecasts by location
+# Cache of columnar forecasts by rounded coordinate key, tracks at the same venue share an entry
 forecast_cache = {}
 
-def get_weather_for_event(event: dict):
-    """Get weather forecast for an event including hourly forecasts and daily high/low temperatures."""
-    try:
-        location = event.get('location', '')
-        event_date_str = event.get('date', '')
-        event_time_str = event.get('time', '')
+# Download time (epoch) of each cached forecast, fresh entries survive clear_forecast_cache in long-running processes
+forecast_fetch_times = {}
+
+# Page requests made for each downloaded forecast cell, used to report calls saved by dedup
+forecast_request_counts = {}
+
+# Locations already added to the all 10 day forecasts file this refresh
+recorded_locations = set()
+
+# Forecast cells left out of this refresh's downloads to stay within the API quota, served stale or not at all
+skipped_forecast_cells = set()
+
+# Processed 10 day forecasts by track name, written to the all-locations file once per refresh
+all_locations_forecasts = {}
+
+# Per-thread count of Google Weather API requests, response bytes and retries, lets each fetch worker
+# measure its own download
+request_counter = threading.local()
 
-        if not all([location, event_date_str, event_time_str]):
-            return {}
+# Persistent forecast store, serves forecasts downloaded by earlier runs until they expire
+forecast_store = ForecastStore()
 
-        # Get forecast data for this location
-        forecast_data = get_location_forecast(location)
-        if not forecast_data:
-            return {}
+# ETag/Last-Modified validators and bodies of Google Weather API responses, for conditional requests
+validator_cache = ValidatorCache()
+
+# Client-side rate limit and daily quota budget shared by every Google Weather API request
+api_rate_limiter = TokenBucket(API_RATE_LIMIT_PER_SECOND, API_RATE_LIMIT_BURST)
+api_quota = QuotaBudget(API_DAILY_QUOTA, API_QUOTA_STATE_FILE, API_QUOTA_RESET_TIMEZONE)
+
+# Stage timings and request counts of the current weather refresh, written out at the end of each run
+run_metrics = RunMetrics('racing_weather', METRICS_TEXTFILE_DIR, WEATHER_RUN_SUMMARY_FILE)
+
+# Locks shared by the concurrent fetch workers (cache dict and shared output files)
+forecast_cache_lock = threading.Lock()
+forecast_file_lock = threading.Lock()
+
+def get_weather_for_event(event: Event, forecasts=None):
+    """Get weather forecast for an event including hourly forecasts and daily high/low temperatures, None if unavailable.
+
+    Args:
+        forecasts: Prefetched {location: forecast}, if given the event's forecast is only looked up there.
+            Otherwise it is fetched with get_location_forecast, downloading it on a cache miss.
+    """
+    try:
+        if not all([event.location, event.date, event.time]):
+            return None
 
-        # Parse event time
-        event_time_str = parse_event_time(event_time_str)
+        # Get the columnar forecast for this location
+        if forecasts is not None:
+            forecast = forecasts.get(event.location)
+        else:
+            forecast = get_location_forecast(event.location)
+        if forecast is None:
+            return None
 
-        # Convert EST event time from schedule file to UTC
-        event_datetime_utc = convert_est_to_utc(event_date_str, event_time_str)
-        if not event_datetime_utc:
-            return {}
+        # UTC start time, precomputed by the schedule index
+        event_epoch = event.start_epoch
+        if event_epoch is None:
+            event_epoch = local_to_utc_epoch(event.date, event.time)
+        if event_epoch is None:
+            return None
+        event_datetime_utc = utc_datetime(event_epoch)
 
         # Get current time in UTC for dynamic window calculation
         current_time_utc = datetime.now(timezone.utc).replace(tzinfo=None)
 
-        # Extract daily high and low temperatures for the event date (use original date)
-        event_date = datetime.strptime(event_date_str, '%Y-%m-%d')
-        daily_max_min = extract_daily_high_low_temps(forecast_data, event_date)
-
-        # Extract hours from weather file
-        forecast_hours = forecast_data.get('forecastHours', [])
-        relevant_forecasts = []
+        # Look up precomputed daily high and low temperatures for the event date (use original date)
+        event_date = parse_local_datetime(event.date, event.time).date()
+        daily_max_min = forecast.daily_high_low(event_date)
 
         # Calculate dynamic forecast window based on current time and event time
         if current_time_utc < event_datetime_utc:
@@ -62,62 +116,132 @@ def get_weather_for_event(event: dict):
             window_start = current_time_utc
             window_end = event_datetime_utc + timedelta(hours=(FORECAST_HOURS_AFTER_EVENT))
 
-        # Save forecast data within the calculated window
-        for forecast_hour in forecast_hours:
-            
-            # Parse the forecast time (UTC from Google API)
-            hour = forecast_hour.get('interval', {}).get('startTime', '')
-            
-            # Parse UTC timestamp: "2025-06-27T18:00:00Z"
-            forecast_dt_utc = datetime.fromisoformat(hour.replace('Z', '+00:00'))
-            forecast_dt_utc = forecast_dt_utc.replace(tzinfo=None)  # Remove timezone info for comparison
-            
-            # Check if this forecast is within the calculated window
-            if window_start <= forecast_dt_utc <= window_end:
-                # Get original values and convert units
-                temp_fahrenheit = celsius_to_fahrenheit(forecast_hour.get('temperature', {}).get('degrees'))
-                feels_like_fahrenheit = celsius_to_fahrenheit(
-                    forecast_hour.get('feelsLikeTemperature', {}).get('degrees'))
-                wind_speed_mph = kph_to_mph(forecast_hour.get('wind', {}).get('speed', {}).get('value'))
-
-                # Save hourly weather conditions
-                weather_info = {
-                    'time': hour,
-                    'temperature': temp_fahrenheit,
-                    'feels_like': feels_like_fahrenheit,
-                    'condition': forecast_hour.get('weatherCondition', {}).get('description', {}).get('text', 'N/A'),
-                    'precipitation_type': forecast_hour.get('precipitation', {}).get('probability', {}).get('type', 'N/A'),
-                    'precipitation_prob': forecast_hour.get('precipitation', {}).get('probability', {}).get('percent', 'N/A'),
-                    'wind_speed': wind_speed_mph,
-                    'wind_speed_direction': forecast_hour.get('wind', {}).get('direction', {}).get('cardinal', 'N/A')
-                }
-                relevant_forecasts.append(weather_info)
+        # Select forecast hours within the calculated window by binary search over the sorted time column
+        window = forecast.window_slice(window_start.replace(tzinfo=timezone.utc).timestamp(),
+                                       window_end.replace(tzinfo=timezone.utc).timestamp())
+        relevant_forecasts = forecast.hourly_forecasts(slice(window.start, min(window.stop, window.start + 5)))  # Limit to 5 hours
 
         # Return both hourly forecasts and daily high/low temperatures
-        return {
-            'hourly_forecast': relevant_forecasts[:5],  # Limit to 5 hours
-            'daily_high': daily_max_min['high'],
-            'daily_low': daily_max_min['low']
-        }
+        return EventWeather(relevant_forecasts, daily_max_min['high'], daily_max_min['low'])
 
     except Exception as e:
-        logger.error(f"Error processing weather for {event.get('location', 'unknown')}: {e}")
-        return {}
+        logger.error(f"Error processing weather for {event.location or 'unknown'}: {e}")
+        return None
+
+
+def group_locations_by_cell(locations):
+    """Return the distinct locations and those locations grouped by forecast grid cell, both in first-seen order."""
+    unique_locations = list(dict.fromkeys(location for location in locations if location))
+
+    # Venues sharing coordinates share a cell and cost one download
+    locations_by_cell = {}
+    for location in unique_locations:
+        locations_by_cell.setdefault(get_forecast_key(location), []).append(location)
+    return unique_locations, locations_by_cell
+
+
+def budget_forecast_downloads(locations_by_cell):
+    """
+    Return one location per forecast cell to fetch, leaving out downloads today's API quota can't cover.
+
+    Cells already fresh in memory or in the store cost nothing. When the remaining quota can't cover every
+    other cell, the first cells (soonest events) are downloaded and the rest are served a stale stored copy.
+    """
+    representatives = [cell_locations[0] for cell_locations in locations_by_cell.values()]
+    with forecast_cache_lock:
+        cached_cells = set(forecast_cache)
+    downloads = [location for cell, location in zip(locations_by_cell, representatives)
+                 if cell and cell not in cached_cells and not forecast_store.is_fresh(cell)]
+
+    requests_per_forecast = expected_forecast_requests()
+    remaining = api_quota.remaining()
+    affordable = remaining // requests_per_forecast
+    if len(downloads) <= affordable:
+        return representatives
+
+    logger.warning(f"API quota low ({remaining} requests left today), downloading the {affordable} soonest "
+                   f"of {len(downloads)} forecasts and serving stored forecasts for the rest")
+    skipped = downloads[affordable:]
+    for location in skipped:
+        skip_forecast_download(location)
+    return [location for location in representatives if location not in skipped]
+
+
+def expected_forecast_requests():
+    """Requests to budget for one forecast download, the largest page count seen so far."""
+    with forecast_cache_lock:
+        return max(max(forecast_request_counts.values(), default=API_PAGES_PER_FORECAST), 1)
+
+
+def skip_forecast_download(location: str):
+    """Leave a location's cell out of this refresh's downloads, later lookups get its stale stored copy or None."""
+    forecast_key = get_forecast_key(location)
+    with forecast_cache_lock:
+        skipped_forecast_cells.add(forecast_key)
+    return serve_stale_forecast(location)
+
+
+def is_download_skipped(forecast_key):
+    with forecast_cache_lock:
+        return forecast_key in skipped_forecast_cells
+
+
+def serve_stale_forecast(location: str):
+    """Serve the stored forecast for a location whatever its age, None if nothing is stored."""
+    forecast_key = get_forecast_key(location)
+    stored_data = forecast_store.get(forecast_key, allow_stale=True) if forecast_key else None
+    if stored_data is None:
+        logger.warning(f"No stored forecast to fall back on for {location}")
+        return None
+
+    logger.info(f"Using stale stored forecast for {location} to save API quota")
+    run_metrics.increment('forecast_lookups', source='stale')
+    return cache_stored_forecast(forecast_key, location, stored_data)
+
+
+def log_prefetch_results(results, locations_by_cell):
+    """Log the downloads saved by coordinate dedup, any locations whose forecast failed and conditional request stats."""
+    unique_locations = list(results)
+    saved_downloads = len(unique_locations) - len(locations_by_cell)
+    if saved_downloads:
+        saved_requests = sum(
+            forecast_request_counts.get(cell, 0) * (len(cell_locations) - 1)
+            for cell, cell_locations in locations_by_cell.items()
+        )
+        logger.info(f"{len(unique_locations)} locations resolved to {len(locations_by_cell)} forecast cells, "
+                    f"coordinate dedup saved {saved_downloads} forecast downloads ({saved_requests} API calls)")
+
+    failed = [location for location, forecast in results.items() if forecast is None]
+    if failed:
+        logger.warning(f"Forecast download failed for {len(failed)} locations: {', '.join(failed)}")
+
+    log_http_cache_stats()
+
+
+def get_forecast_key(location: str, json_file=TRACKS_FILE):
+    """Return the rounded coordinate cache key for a track name, or None if the track is unknown."""
+    track = get_track_registry(json_file).get_by_name(location)
+    if not track:
+        return None
+    return coordinate_key(track.latitude, track.longitude)
 
 
 def get_location_forecast(location: str):
-    """Get forecast data for a location, using cache if available."""
+    """Get the parsed forecast for a location, using cache if available."""
+    forecast_key = get_forecast_key(location)
+    if not forecast_key:
+        logger.error(f"Error getting forecast for {location}: track not found in the data")
+        return None
 
-    # Check if we already have forecast data for this location (avoid redundant 10-day weather downloads)
-    if location in forecast_cache:
-        logger.info(f"Using cached forecast for event at {location}, weather data already downloaded")
-        return forecast_cache[location]
+    cached_forecast = get_cached_location_forecast(forecast_key, location)
+    if cached_forecast is not None:
+        return cached_forecast
+    if is_download_skipped(forecast_key):
+        return None
 
     try:
-        # Load variables from .env into environment
-        load_dotenv()
         # Access the API key
-        api_key = os.getenv("MAPSAPI_KEY")
+        api_key = get_api_key()
         if not api_key:
             logger.warning("Warning: MAPSAPI_KEY environment variable not set. Please check your .env file.")
             return None
@@ -126,51 +250,134 @@ def get_location_forecast(location: str):
         weather_url = build_weather_api_url(location, api_key)
 
         logger.info("Downloading data from Google Weather API...")
-        # Get forecast data
-        forecast_data = download_maps_api_data(weather_url)
-
-        # Cache the result
-        forecast_cache[location] = forecast_data
-
-        # Process and save the forecast data to the file that contains all 10 day forecasts
-        save_10_day_location_forecast(forecast_data, location)
-
+        # Get forecast data, counting the page requests, bytes and retries it took
+        counts_before = read_request_counts(request_counter)
+        download_start = time.perf_counter()
+        # Reserve the whole page chain first, so the quota never cuts a download off halfway
+        with api_quota.reserve(expected_forecast_requests()) as reservation:
+            forecast_data = download_maps_api_data(weather_url, archive_name=location, reservation=reservation)
+        request_count, body_bytes, retries = (after - before for after, before
+                                              in zip(read_request_counts(request_counter), counts_before))
+        record_forecast_download(location, time.perf_counter() - download_start, request_count, body_bytes, retries)
+
+        forecast = cache_downloaded_forecast(forecast_key, location, forecast_data, request_count)
         logger.info(f"Downloaded and cached forecast for {location}")
 
-        return forecast_data
+        return forecast
+    except QuotaExceededError as e:
+        logger.error(f"Error getting forecast for {location}: {e}")
+        return skip_forecast_download(location)
     except Exception as e:
         logger.error(f"Error getting forecast for {location}: {e}")
         return None
 
 
+def get_prefetched_forecast(location: str):
+    """Get the forecast for a location from memory or the persistent store only, None rather than downloading it."""
+    forecast_key = get_forecast_key(location)
+    if not forecast_key:
+        return None
+    return get_cached_location_forecast(forecast_key, location)
+
+
+def get_cached_location_forecast(forecast_key, location):
+    """Return the forecast for a cell from memory or the persistent store, or None if it must be downloaded."""
+    # Check if we already have forecast data for this grid cell (avoid redundant 10-day weather downloads)
+    with forecast_cache_lock:
+        cached_forecast = forecast_cache.get(forecast_key)
+    if cached_forecast is not None:
+        logger.info(f"Using cached forecast for event at {location}, weather data already downloaded")
+        run_metrics.increment('forecast_lookups', source='memory')
+        record_location_forecast(cached_forecast, location)
+        return cached_forecast
+
+    # Serve a fresh forecast from an earlier run if the store has one
+    stored_data = forecast_store.get(forecast_key)
+    if stored_data is not None:
+        logger.info(f"Using stored forecast for {location}, skipping download")
+        run_metrics.increment('forecast_lookups', source='store')
+        return cache_stored_forecast(forecast_key, location, stored_data)
+
+    return None
+
+
+def cache_stored_forecast(forecast_key, location, stored_data):
+    """Cache a forecast read from the store under its original download time, and record the location."""
+    stored_forecast = ForecastFrame.from_dict(stored_data)
+    with forecast_cache_lock:
+        forecast_cache[forecast_key] = stored_forecast
+        forecast_fetch_times[forecast_key] = forecast_store.fetched_at(forecast_key) or time.time()
+    record_location_forecast(stored_forecast, location)
+    return stored_forecast
+
+
+def record_forecast_download(location, seconds, request_count, body_bytes=0, retries=0):
+    """Record the latency, page requests, response bytes and retries of one location's forecast download."""
+    run_metrics.increment('forecast_lookups', source='download')
+    run_metrics.observe('forecast_download_seconds', seconds, location=location)
+    run_metrics.increment('forecast_pages', request_count, location=location)
+    run_metrics.increment('forecast_response_bytes', body_bytes, location=location)
+    run_metrics.increment('forecast_retries', retries, location=location)
+
+
+def cache_downloaded_forecast(forecast_key, location, forecast_data, request_count):
+    """Parse a downloaded API response, cache and store it, and add it to the all 10 day forecasts file."""
+    # Parse once into columns and cache the result, the nested API response is not kept
+    forecast = ForecastFrame.from_api(forecast_data)
+    with forecast_cache_lock:
+        forecast_cache[forecast_key] = forecast
+        forecast_fetch_times[forecast_key] = time.time()
+        forecast_request_counts[forecast_key] = request_count
+    forecast_store.put(forecast_key, forecast.to_dict())
+
+    # Process and save the forecast data to the file that contains all 10 day forecasts
+    record_location_forecast(forecast, location)
+    return forecast
+
+
+def get_api_key():
+    """Return the Google Maps API key, loading .env into the environment only if it is not already set."""
+    api_key = os.getenv("MAPSAPI_KEY")
+    if not api_key:
+        # Load variables from .env into environment
+        load_dotenv()
+        api_key = os.getenv("MAPSAPI_KEY")
+    return api_key
+
+
+def record_location_forecast(forecast, location):
+    """Add a location to the all 10 day forecasts file once per refresh, locations sharing a cell each get an entry."""
+    with forecast_cache_lock:
+        if location in recorded_locations:
+            return
+        recorded_locations.add(location)
+    save_10_day_location_forecast(forecast, location)
+
+
 def build_weather_api_url(track_name, api_key, json_file=TRACKS_FILE):
     '''Builds a weather forecast URL for a given track name using the Google Maps API.'''
-    # Load the track data from JSON
-    with open(json_file, 'r') as file:
-        tracks = json.load(file)
-
-    # Normalize input to allow case-insensitive match
-    track_name = track_name.strip().upper()
-
-    # Find the matching track
-    for track in tracks:
-        if track['name'].upper() == track_name:
-            latitude = track['latitude']
-            longitude = track['longitude']
-            # Build the URL, MAPS API uses latitude and longitude for location
-            params = {
-                "key": api_key,
-                "location.latitude": latitude,
-                "location.longitude": longitude
-            }
-            return f"{MAPSAPI_BASE_URL}?{urllib.parse.urlencode(params)}"
+    # Case-insensitive lookup in the cached track index
+    track = get_track_registry(json_file).get_by_name(track_name)
+    if not track:
+        logger.error(f"Track '{track_name}' not found in the data.")
+        raise ValueError(f"Track '{track_name}' not found in the data.")
+
+    # Build the URL, MAPS API uses latitude and longitude for location
+    # Request the rounded grid cell so every track sharing it gets the same forecast
+    latitude, longitude = round_coordinates(track.latitude, track.longitude)
+    params = {
+        "key": api_key,
+        "location.latitude": latitude,
+        "location.longitude": longitude
+    }
+    return f"{MAPSAPI_BASE_URL}?{urllib.parse.urlencode(params)}"
 
-    logger.error(f"Track '{track_name}' not found in the data.")
-    raise ValueError(f"Track '{track_name}' not found in the data.")
 
+def download_maps_api_data(maps_api_url, archive_name=None, reservation=None):
+    '''Fetches weather forecast data from the Google Maps API, archiving the raw response when debugging is enabled.
 
-def download_maps_api_data(maps_api_url, output_file=TRACK_FORECAST_FILE):
-    '''Fetches weather forecast data from the Google Maps API and saves it to a JSON file.'''
+    Requests are taken from reservation if given, otherwise from the daily quota one page at a time.
+    '''
     all_forecast_data = {
         "forecastHours": []
     }
@@ -180,8 +387,7 @@ def download_maps_api_data(maps_api_url, output_file=TRACK_FORECAST_FILE):
     # Loop through paginated results
     while next_url:
         try:
-            response = make_api_request(next_url)
-            data = response.json()
+            data = make_api_request(next_url, reservation)
 
             # Append current page's forecast data
             hours = data.get("forecastHours", [])
@@ -199,141 +405,165 @@ def download_maps_api_data(maps_api_url, output_file=TRACK_FORECAST_FILE):
             logger.error(f"Failed to download API data: {e}")
             raise
 
-    # Save to file
-    os.makedirs(os.path.dirname(output_file), exist_ok=True)
-    with open(output_file, 'w') as f:
-        json.dump(all_forecast_data, f, indent=2)
+    # Raw responses are only kept for debugging, production skips this I/O entirely
+    if RAW_FORECAST_ARCHIVE_ENABLED and archive_name:
+        archive_raw_forecast(all_forecast_data, archive_name)
 
-    logger.info(f"Forecast saved to {output_file}")
     return all_forecast_data
 
 
+def archive_raw_forecast(forecast_data, location, archive_dir=RAW_FORECAST_ARCHIVE_DIR, keep=RAW_FORECAST_ARCHIVE_KEEP):
+    '''Save a compressed copy of a raw forecast response per location, keeping only the newest archives.'''
+    try:
+        location_slug = re.sub(r'[^A-Za-z0-9]+', '_', location).strip('_').lower()
+        location_dir = os.path.join(archive_dir, location_slug)
+        os.makedirs(location_dir, exist_ok=True)
+
+        timestamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+        archive_file = os.path.join(location_dir, f"{timestamp}.json.gz")
+        with gzip.open(archive_file, 'wt', encoding='utf-8') as f:
+            json.dump(forecast_data, f)
+
+        # Rotate, timestamped names sort oldest first
+        archives = sorted(name for name in os.listdir(location_dir) if name.endswith('.json.gz'))
+        for old_archive in archives[:-keep] if keep > 0 else archives:
+            os.remove(os.path.join(location_dir, old_archive))
+
+        logger.info(f"Archived raw forecast for {location} to {archive_file}")
+    except Exception as e:
+        logger.error(f"Error archiving raw forecast for {location}: {e}")
+
+
+# Rate limiting and server errors are retried, other non-200 responses are not
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+def api_retry(*exception_types):
+    """Tenacity retry policy shared by the sync and async Google Weather API clients, retries are counted in run_metrics."""
+    log_retry = before_sleep_log(logger, logging.WARNING)
+
+    def before_sleep(retry_state):
+        run_metrics.increment('api_retries')
+        counter = retry_state.kwargs.get('counter', request_counter)
+        counter.retries = getattr(counter, 'retries', 0) + 1
+        log_retry(retry_state)
+
+    return retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        retry=retry_if_exception_type(exception_types),
+        before_sleep=before_sleep
+    )
+
+
+def record_api_response(status, seconds, body_bytes=0, counter=request_counter):
+    """Record the status, latency and size of one Google Weather API response, bytes also go to the download's counter."""
+    run_metrics.increment('api_requests', status=status)
+    run_metrics.observe('api_request_seconds', seconds)
+    run_metrics.increment('api_response_bytes', body_bytes)
+    counter.bytes = getattr(counter, 'bytes', 0) + body_bytes
+
+
+def read_request_counts(counter):
+    """Requests, response bytes and retries counted so far on a request counter."""
+    return getattr(counter, 'count', 0), getattr(counter, 'bytes', 0), getattr(counter, 'retries', 0)
+
+
 # API retry logic using tenacity
-@retry(
-    stop=stop_after_attempt(3),
-    wait=wait_exponential(multiplier=1, min=1, max=10),
-    retry=retry_if_exception_type((
-        requests.exceptions.RequestException,
-        requests.exceptions.Timeout,
-        requests.exceptions.ConnectionError
-    )),
-    before_sleep=before_sleep_log(logger, logging.WARNING)
+@api_retry(
+    requests.exceptions.RequestException,
+    requests.exceptions.Timeout,
+    requests.exceptions.ConnectionError
 )
+def make_api_request(url, reservation=None):
+    """Make a conditional API request with retry logic using tenacity, returns the decoded JSON page."""
+    wait_for_api_budget(reservation)
+    request_counter.count = getattr(request_counter, 'count', 0) + 1
+    request_start = time.perf_counter()
+    response = get_session(url).get(url, headers=validator_cache.request_headers(url), timeout=API_TIMEOUT)
+    record_api_response(response.status_code, time.perf_counter() - request_start, len(response.content))
+
+    # Unchanged since the last download, answer from the saved copy
+    if response.status_code == 304:
+        body = validator_cache.not_modified_body(url)
+        if body is not None:
+            return json.loads(body)
+        wait_for_api_budget(reservation)
+        request_start = time.perf_counter()
+        response = get_session(url).get(url, timeout=API_TIMEOUT)
+        record_api_response(response.status_code, time.perf_counter() - request_start, len(response.content))
 
-def make_api_request(url):
-    """Make API request with retry logic using tenacity."""
-    response = requests.get(url, timeout=API_TIMEOUT)
-    
     # Retry on server errors and rate limiting
-    if response.status_code in [429, 500, 502, 503, 504]:
+    if response.status_code in RETRYABLE_STATUS_CODES:
         raise requests.exceptions.RequestException(f"API request failed with status code {response.status_code}")
     elif response.status_code != 200:
         # Don't retry on client errors (4xx except 429)
         logger.error(f"API request failed with non-retryable status code {response.status_code}")
         raise Exception(f"API request failed with status code {response.status_code}")
-    
-    return response
+
+    validator_cache.store_response(url, response.headers, response.content)
+    return response.json()
 
 
-def extract_daily_high_low_temps(forecast_data, event_date):
-    """Extract daily high and low temperatures for the given date from forecast data."""
+def wait_for_api_budget(reservation=None):
+    """Take one request from the reservation or today's quota, raising QuotaExceededError if it is used up, then wait for the rate limit."""
+    if reservation is not None:
+        reservation.take()
+    else:
+        api_quota.consume()
+    api_rate_limiter.acquire()
+
+
+def save_10_day_location_forecast(forecast, location, json_file=TRACKS_FILE):
+    """Add a location's 10 day temp/precipitation forecast to the all-locations forecasts collected this refresh.
+
+    Nothing is written here, publish_all_locations_forecast writes the file once all locations are collected.
+    """
     try:
-        # Get hourly forecast data
-        forecast_hours = forecast_data.get('forecastHours', [])
-
-        # Collect all temperatures for the event date
-        daily_temperatures = []
-
-        for forecast_hour in forecast_hours:
-            display_time = forecast_hour.get('displayDateTime', {})
-            forecast_dt = datetime(
-                year=display_time.get('year', 0),
-                month=display_time.get('month', 0),
-                day=display_time.get('day', 0),
-                hour=display_time.get('hours', 0),
-                minute=display_time.get('minutes', 0)
-            )
-
-            # Check if this forecast is for the same date as the event
-            if forecast_dt.date() == event_date.date():
-                temp_data = forecast_hour.get('temperature', {})
-                temp_value = temp_data.get('degrees')
-                if temp_value is not None:
-                    # Convert Celsius to Fahrenheit
-                    temp_fahrenheit = celsius_to_fahrenheit(temp_value)
-                    daily_temperatures.append(temp_fahrenheit)
-
-        if daily_temperatures:
-            return {
-                'high': max(daily_temperatures),
-                'low': min(daily_temperatures)
-            }
-        else:
-            # No temperature data found for the date
-            return {
-                'high': 'N/A',
-                'low': 'N/A'
+        # Look up the track/speedway name
+        track_name = get_track_registry(json_file).get_by_name(location).track_name
+
+        # Add this location's data to the all location forecasts, converted from the frame's columns
+        processed_hours = forecast.ten_day_hours()
+        with forecast_file_lock:
+            all_locations_forecasts[track_name] = {
+                "forecastHours": processed_hours
             }
 
+        logger.info(f"Collected 10 day forecast for {location}")
+
     except Exception as e:
-        logger.error(f"Error extracting daily temperatures: {e}")
-        return {
-            'high': 'N/A',
-            'low': 'N/A'
-        }
+        logger.error(f"Error processing forecast data for {location}: {e}")
 
 
-def save_10_day_location_forecast(forecast_data, location, json_file=TRACKS_FILE):
-    """Save 10 day track temp/precipication forecast to the json file that contains all 10 day track forecasts"""
-    try:
-        # Load existing data if file exists  
-        try:
-            with open(ALL_LOCATIONS_FORECAST_FILE, 'r') as f:
-                all_locations_data = json.load(f)
-        except FileNotFoundError:
-            all_locations_data = {}
-        
-        # Load tracks and extract the track/speedway name
-        with open(json_file, 'r') as file:
-            tracks = json.load(file)
-
-        for track in tracks:
-            if track['name'].upper() == location:
-                track_name = track['trackName']
-
-        # Process the forecast data for this location
-        processed_hours = []
-        
-        if 'forecastHours' in forecast_data:
-            for hour in forecast_data['forecastHours']:
-                processed_hour = {
-                    "time": hour.get('interval', {}).get('startTime', ''),
-                    "tempFahrenheit": round(celsius_to_fahrenheit(hour.get('temperature', {}).get('degrees', 0)), 1),
-                    "precipitationPercent": hour.get('precipitation', {}).get('probability', {}).get('percent', 0)
-                }
-                processed_hours.append(processed_hour)
-        
-        # Add this location's data to the all location foreacast file
-        all_locations_data[track_name] = {
-            "forecastHours": processed_hours
-        }
-        
-        # Save back to file
-        with open(ALL_LOCATIONS_FORECAST_FILE, 'w') as f:
-            json.dump(all_locations_data, f, indent=2)
-        
-        logger.info(f"Saved forecast data for {location} to all 10 day forecasts file")
-        
-    except Exception as e:
-        logger.error(f"Error processing and saving forecast data for {location}: {e}")
+def publish_all_locations_forecast(file_path=ALL_LOCATIONS_FORECAST_FILE):
+    """Write every collected location forecast to the all 10 day forecasts file in a single atomic write."""
+    with forecast_file_lock:
+        snapshot = dict(all_locations_forecasts)
+    if publish_json(snapshot, file_path, compress=PUBLISHED_FILE_COMPRESSION):
+        logger.info(f"Published 10 day forecasts for {len(snapshot)} tracks to {file_path}")
 
 
-def clear_forecast_cache():
-    """Clear the forecast cache and saved all-locations forecasts file."""
-    forecast_cache.clear()
+def log_http_cache_stats():
+    """Log and reset this run's conditional request hits and misses for the Google Weather API."""
+    validator_cache.log_stats("Google Weather API")
 
-    # Clear the forecast file 
-    with open(ALL_LOCATIONS_FORECAST_FILE, 'w') as f:
-        json.dump({}, f)
 
-    logger.info("Forecast cache cleared")
\ No newline at end of file
+def clear_forecast_cache():
+    """Drop stale forecasts from the in-memory cache and clear the location forecasts collected for the all-locations file.
+
+    Forecasts younger than FORECAST_CACHE_TTL_MINUTES stay cached so a long-running process reuses them.
+    The persistent forecast store is left alone, fresh entries are reused and the file is rebuilt from them.
+    """
+    oldest_fresh = time.time() - FORECAST_CACHE_TTL_MINUTES * 60
+    with forecast_cache_lock:
+        for forecast_key in list(forecast_cache):
+            if forecast_fetch_times.get(forecast_key, 0) < oldest_fresh:
+                forecast_cache.pop(forecast_key, None)
+                forecast_fetch_times.pop(forecast_key, None)
+        recorded_locations.clear()
+        skipped_forecast_cells.clear()
+    with forecast_file_lock:
+        all_locations_forecasts.clear()
+
+    logger.info("Forecast cache cleared")
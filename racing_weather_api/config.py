@@ -9,6 +9,9 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 # API Settings
 MAPSAPI_BASE_URL = "https://weather.googleapis.com/v1/forecast/hours:lookup"
 API_TIMEOUT = 30  # seconds
+FORECAST_FETCH_MAX_WORKERS = 4  # Max number of track forecasts downloaded concurrently
+HTTP_POOL_CONNECTIONS = 4  # Connection pools kept per session (one per scheme/host/port)
+HTTP_POOL_MAXSIZE = max(FORECAST_FETCH_MAX_WORKERS, 4)  # Idle keep-alive connections kept per host
 
 # File Paths
 DATA_DIR = os.path.join(BASE_DIR, 'data')
@@ -17,9 +20,13 @@ SERIES_SCHEDULES_DIR = os.path.join(DATA_DIR, 'series_schedules')
 TRACKS_FILE = os.path.join(DATA_DIR, 'tracks.json')
 SCHEDULE_FILE = os.path.join(DATA_DIR, 'schedule.json')
 EVENTS_WITH_WEATHER_FILE = os.path.join(DATA_OUTPUT_DIR, 'events_with_weather.json')
-TRACK_FORECAST_FILE = os.path.join(DATA_DIR, 'track_forecast.json')
+TRACK_FORECAST_FILE = os.path.join(DATA_DIR, 'track_forecast.json')  # Sample raw forecast response
 LOG_FILE = os.path.join(BASE_DIR, 'log_file.log')
 ALL_LOCATIONS_FORECAST_FILE = os.path.join(DATA_OUTPUT_DIR, 'all_10_day_forecasts.json')
+FORECAST_CACHE_DIR = os.path.join(DATA_DIR, 'forecast_cache')
+
+# Pre-compressed siblings written next to published output files ('gz', 'br'), served directly by the web server
+PUBLISHED_FILE_COMPRESSION = ['gz']
 
 # Individual series schedule files
 NASCAR_CUP_SCHEDULE_FILE = os.path.join(SERIES_SCHEDULES_DIR, 'nascar_cup_sched.json')
@@ -41,9 +48,6 @@ SERIES_SCHEDULE_FILES = {
     'F1': F1_SCHEDULE_FILE
 }
 
-TRACK_FORECAST_FILE = os.path.join(DATA_DIR, 'track_forecast.json')
-LOG_FILE = os.path.join(BASE_DIR, 'log_file.log')
-
 # Logging
 LOG_LEVEL = 'INFO'
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -53,6 +57,39 @@ FORECAST_HOURS_BEFORE_EVENT = 2
 FORECAST_HOURS_AFTER_EVENT = 3
 USE_CACHED_DATA_BY_DEFAULT = False
 
+# Forecast Store (persists downloaded forecasts between runs)
+FORECAST_CACHE_TTL_MINUTES = 45  # Re-download a track's forecast once it is older than this
+FORECAST_CACHE_MAX_ENTRIES = 100  # Least recently used forecasts are evicted past this size
+FORECAST_COORDINATE_PRECISION = 3  # Decimal places of lat/long, tracks in the same rounded cell share a forecast
+
+# Google Weather API client-side rate limit and daily quota budget
+API_RATE_LIMIT_PER_SECOND = 5  # Sustained requests per second, shared by all fetch workers
+API_RATE_LIMIT_BURST = 10  # Requests allowed back to back before the rate limit applies
+API_DAILY_QUOTA = 5000  # Requests allowed per quota day
+API_QUOTA_RESET_TIMEZONE = 'America/Los_Angeles'  # Google quotas reset at midnight Pacific time
+API_QUOTA_STATE_FILE = os.path.join(DATA_DIR, 'api_quota.json')
+API_PAGES_PER_FORECAST = 10  # Expected requests per forecast download, until one has been measured
+
+# Conditional requests (ETag/Last-Modified revalidation), unchanged responses are served from the saved copy
+HTTP_CACHE_DIR = os.path.join(DATA_DIR, 'http_cache')
+HTTP_CACHE_MAX_ENTRIES = 200  # Oldest saved responses are dropped past this size
+HTTP_CACHE_IGNORED_PARAMS = ('key',)  # Query parameters left out of the cache key (API key)
+
+# Raw API response archive, debug only (keep disabled in production)
+RAW_FORECAST_ARCHIVE_ENABLED = False
+RAW_FORECAST_ARCHIVE_DIR = os.path.join(DATA_DIR, 'raw_forecasts')
+RAW_FORECAST_ARCHIVE_KEEP = 3  # Number of archived responses kept per location
+
+# Run metrics, a Prometheus textfile collector file per job plus a JSON run summary next to the outputs
+METRICS_ENABLED = True
+METRICS_TEXTFILE_DIR = os.path.join(DATA_DIR, 'metrics')  # Point node_exporter's --collector.textfile.directory here
+WEATHER_RUN_SUMMARY_FILE = os.path.join(DATA_OUTPUT_DIR, 'racing_weather_run_summary.json')
+
+# Scheduler daemon (scheduler.py), replaces the cron entries for main.py and river_data_updater.py
+WEATHER_REFRESH_INTERVAL_SECONDS = 60 * 60
+RIVER_UPDATE_INTERVAL_SECONDS = 15 * 60
+SCHEDULER_JITTER_SECONDS = 60  # Random delay added to each run so jobs don't hit the APIs in lockstep
+
 # Series Options
 ENABLED_SERIES = [
     'NASCAR CUP SERIES',
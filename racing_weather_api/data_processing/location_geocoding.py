@@ -1,7 +1,6 @@
 # Stand alone script to geocode the track addresses in the data/tracks.json file using the Google Maps API
 import os
 import sys
-import requests
 from dotenv import load_dotenv
 import logging
 
@@ -9,10 +8,13 @@ import logging
 # Imports for running from this script's folder
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.abspath(os.path.join(current_dir, '..'))
-if parent_dir not in sys.path:
-    sys.path.insert(0, parent_dir)
+repo_root = os.path.abspath(os.path.join(parent_dir, '..'))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
 
-from utils.file_utils import load_json, save_json
+from racing_weather_api.config import API_TIMEOUT
+from racing_weather_api.utils.file_utils import load_json, save_json
+from racing_weather_api.utils.http_client import get_session
 
 # Setup logger
 logger = logging.getLogger(__name__)
@@ -32,7 +34,7 @@ def geocode_address(address, api_key):
         "key": api_key
     }
 
-    response = requests.get(base_url, params=params)
+    response = get_session(base_url).get(base_url, params=params, timeout=API_TIMEOUT)
     if response.status_code == 200:
         data = response.json()
         if data['status'] == 'OK':
@@ -0,0 +1,114 @@
+"""
+Module for the typed, slotted records passed through the weather pipeline.
+
+Each record keeps only the fields the pipeline uses and serializes back to the
+existing JSON shape (same keys, same order) with to_dict.
+"""
+import copy
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True, frozen=True)
+class Track:
+    """A track from tracks.json."""
+    name: str
+    location: str
+    latitude: float
+    longitude: float
+    track_name: str
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['name'], data['location'], data['latitude'], data['longitude'], data['trackName'])
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'location': self.location,
+            'latitude': self.latitude,
+            'longitude': self.longitude,
+            'trackName': self.track_name,
+        }
+
+
+@dataclass(slots=True)
+class HourlyForecast:
+    """One hour of an event forecast, values already converted to display units ('N/A' if missing)."""
+    time: str
+    temperature: object
+    feels_like: object
+    condition: str
+    precipitation_type: str
+    precipitation_prob: object
+    wind_speed: object
+    wind_speed_direction: str
+
+    def to_dict(self):
+        return {
+            'time': self.time,
+            'temperature': self.temperature,
+            'feels_like': self.feels_like,
+            'condition': self.condition,
+            'precipitation_type': self.precipitation_type,
+            'precipitation_prob': self.precipitation_prob,
+            'wind_speed': self.wind_speed,
+            'wind_speed_direction': self.wind_speed_direction,
+        }
+
+
+@dataclass(slots=True)
+class EventWeather:
+    """Forecast attached to an event, hourly rows around the start plus the day's high and low."""
+    hourly_forecast: list
+    daily_high: object
+    daily_low: object
+
+    def to_dict(self):
+        return {
+            'hourly_forecast': [hour.to_dict() for hour in self.hourly_forecast],
+            'daily_high': self.daily_high,
+            'daily_low': self.daily_low,
+        }
+
+
+# Schedule fields in the order they appear in the schedule files and the output
+SCHEDULE_FIELDS = (('Series', 'series'), ('location', 'location'), ('day_of_week', 'day_of_week'),
+                   ('date', 'date'), ('time', 'time'), ('channel', 'channel'))
+
+
+@dataclass(slots=True)
+class Event:
+    """A scheduled event, with its UTC start, matched track and weather filled in by the pipeline."""
+    series: Optional[str] = None
+    location: Optional[str] = None
+    day_of_week: Optional[str] = None
+    date: Optional[str] = None
+    time: Optional[str] = None
+    channel: Optional[str] = None
+    start_epoch: Optional[int] = None
+    start_time_utc: Optional[str] = None
+    track: Optional[Track] = None
+    weather: Optional[EventWeather] = None
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build an event from a schedule file entry."""
+        return cls(**{attribute: data.get(key) for key, attribute in SCHEDULE_FIELDS})
+
+    def copy(self):
+        return copy.copy(self)
+
+    def to_dict(self):
+        """Serialize to the events_with_weather output shape, schedule fields missing from the file are left out."""
+        data = {key: getattr(self, attribute) for key, attribute in SCHEDULE_FIELDS
+                if getattr(self, attribute) is not None}
+        if self.start_time_utc is not None:
+            data['start_time_UTC'] = self.start_time_utc
+        if self.track is not None:
+            data['track_location'] = self.track.location
+            data['track_name'] = self.track.track_name
+            data['track_latitude'] = self.track.latitude
+            data['track_longitude'] = self.track.longitude
+        data['weather'] = self.weather.to_dict() if self.weather is not None else {}
+        return data
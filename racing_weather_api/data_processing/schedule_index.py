@@ -0,0 +1,108 @@
+"""
+Module for the compiled schedule index built from the series schedule files.
+"""
+import os
+import logging
+import threading
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timedelta, timezone, time as dt_time
+from racing_weather_api.utils.file_utils import load_json
+from racing_weather_api.data_processing.models import Event
+from racing_weather_api.utils.time_utils import get_timezone, local_times_to_utc_epochs
+
+logger = logging.getLogger(__name__)
+
+# Schedule start times are compiled manually in Eastern time
+SCHEDULE_TIMEZONE = get_timezone()
+
+
+class ScheduleIndex:
+    """Schedule events as Event records sorted by UTC start time, each with its start epoch and start_time_UTC precomputed."""
+
+    def __init__(self, events, schedule_files=(), mtimes=None):
+        self.schedule_files = tuple(schedule_files)
+        self.mtimes = mtimes
+
+        # Convert every start time in one pass, the results are cached for later per-event lookups
+        events = list(events)
+        start_epochs = local_times_to_utc_epochs([event.get('date', '') for event in events],
+                                                 [event.get('time', '') for event in events])
+        compiled = []
+        for event_data, start_epoch in zip(events, start_epochs):
+            if start_epoch is None:
+                logger.warning(f"Skipping event with invalid date/time: {event_data}")
+                continue
+            event = Event.from_dict(event_data)
+            event.start_epoch = start_epoch
+            event.start_time_utc = datetime.fromtimestamp(start_epoch, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+            compiled.append((start_epoch, event))
+
+        # Stable sort keeps file order for events starting at the same time
+        compiled.sort(key=lambda item: item[0])
+        self.start_epochs = array('q', (start_epoch for start_epoch, _ in compiled))
+        self.events = [event for _, event in compiled]
+
+    @classmethod
+    def from_files(cls, schedule_files):
+        """Build an index from schedule JSON files, unreadable files are logged and skipped."""
+        mtimes = {}
+        events = []
+        for schedule_file in schedule_files:
+            try:
+                mtimes[schedule_file] = os.path.getmtime(schedule_file)
+                schedule_data = load_json(schedule_file)
+                if schedule_data:
+                    events.extend(schedule_data)
+            except Exception as e:
+                logger.error(f"Error loading schedule {schedule_file}: {e}")
+        return cls(events, schedule_files=schedule_files, mtimes=mtimes)
+
+    def events_between(self, start_epoch, end_epoch):
+        """Copies of the events starting within [start_epoch, end_epoch), found by binary search."""
+        start = bisect_left(self.start_epochs, start_epoch)
+        end = bisect_left(self.start_epochs, end_epoch)
+        return [event.copy() for event in self.events[start:end]]
+
+    def upcoming_events(self, now=None, days=7, started_grace_hours=2):
+        """
+        Events dated today through today + days (Eastern), excluding events that started
+        more than started_grace_hours ago.
+        """
+        now = now or datetime.now(SCHEDULE_TIMEZONE)
+        today = now.astimezone(SCHEDULE_TIMEZONE).date()
+        window_start = max(datetime.combine(today, dt_time(), SCHEDULE_TIMEZONE).timestamp(),
+                           now.timestamp() - started_grace_hours * 3600)
+        window_end = datetime.combine(today + timedelta(days=days + 1), dt_time(), SCHEDULE_TIMEZONE).timestamp()
+
+        events = self.events_between(int(window_start), int(window_end))
+        logger.info(f"Found {len(events)} events for next {days} days {today} to {today + timedelta(days=days)}")
+        return events
+
+    def __len__(self):
+        return len(self.events)
+
+
+# Indexes compiled so far, keyed by the tuple of schedule files
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def get_schedule_index(schedule_files):
+    """Return the cached index for schedule_files, recompiling it if any file changed on disk."""
+    schedule_files = tuple(schedule_files)
+    with _indexes_lock:
+        index = _indexes.get(schedule_files)
+        if index is None or any(_mtime(schedule_file) != index.mtimes.get(schedule_file)
+                                for schedule_file in schedule_files):
+            index = ScheduleIndex.from_files(schedule_files)
+            _indexes[schedule_files] = index
+            logger.info(f"Compiled schedule index of {len(index)} events from {len(schedule_files)} file(s)")
+        return index
+
+
+def _mtime(file_path):
+    try:
+        return os.path.getmtime(file_path)
+    except OSError:
+        return None
@@ -0,0 +1,92 @@
+"""
+Module for the in-memory track index built from tracks.json.
+"""
+import os
+import logging
+import threading
+from racing_weather_api.config import TRACKS_FILE, FORECAST_COORDINATE_PRECISION
+from racing_weather_api.utils.file_utils import load_json
+from racing_weather_api.data_processing.models import Track
+
+logger = logging.getLogger(__name__)
+
+
+def round_coordinates(latitude, longitude, precision=FORECAST_COORDINATE_PRECISION):
+    """Round a coordinate pair to the forecast grid precision."""
+    return round(latitude, precision), round(longitude, precision)
+
+
+def coordinate_key(latitude, longitude, precision=FORECAST_COORDINATE_PRECISION):
+    """Build a stable string key for the grid cell containing a coordinate pair, e.g. '35.410,-80.582'."""
+    latitude, longitude = round_coordinates(latitude, longitude, precision)
+    return f"{latitude:.{precision}f},{longitude:.{precision}f}"
+
+
+class TrackRegistry:
+    """Track lookups by name and trackName, loaded once from tracks.json into Track records."""
+
+    def __init__(self, tracks, json_file=TRACKS_FILE, mtime=None):
+        self.json_file = json_file
+        self.mtime = mtime
+        self.tracks = [track if isinstance(track, Track) else Track.from_dict(track) for track in tracks]
+        self._by_name = {}
+        self._by_track_name = {}
+        self._by_coordinates = {}
+
+        # Keep the first entry for duplicated keys, matching the old linear scans
+        for track in self.tracks:
+            self._by_name.setdefault(track.name.strip().upper(), track)
+            self._by_track_name.setdefault(track.track_name.strip().upper(), track)
+            coordinates = (track.latitude, track.longitude)
+            self._by_coordinates.setdefault(coordinates, []).append(track)
+
+    @classmethod
+    def from_file(cls, json_file=TRACKS_FILE):
+        """Build a registry from a tracks JSON file."""
+        mtime = os.path.getmtime(json_file)
+        tracks = load_json(json_file)
+        if tracks is None:
+            raise ValueError(f"Could not load track data from {json_file}")
+        return cls(tracks, json_file=json_file, mtime=mtime)
+
+    def get_by_name(self, name):
+        """Case-insensitive lookup by the schedule location name, e.g. 'CHARLOTTE'."""
+        if not name:
+            return None
+        return self._by_name.get(name.strip().upper())
+
+    def get_by_track_name(self, track_name):
+        """Case-insensitive lookup by speedway name, e.g. 'Charlotte Motor Speedway'."""
+        if not track_name:
+            return None
+        return self._by_track_name.get(track_name.strip().upper())
+
+    def unique_coordinates(self):
+        """Map each distinct (latitude, longitude) to the tracks located there, e.g. ROVAL and CHARLOTTE."""
+        return {coordinates: list(tracks) for coordinates, tracks in self._by_coordinates.items()}
+
+    def forecast_cells(self, precision=FORECAST_COORDINATE_PRECISION):
+        """Map each rounded coordinate key to the tracks that fall in that forecast grid cell."""
+        cells = {}
+        for track in self.tracks:
+            cells.setdefault(coordinate_key(track.latitude, track.longitude, precision), []).append(track)
+        return cells
+
+    def __len__(self):
+        return len(self.tracks)
+
+
+# Registries loaded so far, keyed by file path
+_registries = {}
+_registries_lock = threading.Lock()
+
+
+def get_track_registry(json_file=TRACKS_FILE):
+    """Return the cached registry for json_file, reloading it if the file changed on disk."""
+    with _registries_lock:
+        registry = _registries.get(json_file)
+        if registry is None or os.path.getmtime(json_file) != registry.mtime:
+            registry = TrackRegistry.from_file(json_file)
+            _registries[json_file] = registry
+            logger.info(f"Loaded {len(registry)} tracks from {json_file}")
+        return registry
@@ -2,9 +2,7 @@
 Utility functions for handling units conversion and data formatting.
 """
 import logging
-import pytz
-from datetime import datetime
-from zoneinfo import ZoneInfo
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -29,101 +27,43 @@ def kph_to_mph(kph):
         return 'N/A'
 
 
-def convert_est_to_utc(event_date_str: str, event_time_str: str):
-    """Convert EST event time to UTC datetime."""
-    try:
-        # Parse event date and time
-        event_date = datetime.strptime(event_date_str, '%Y-%m-%d')
-        event_time = datetime.strptime(event_time_str, '%I:%M %p')
-        event_datetime = event_date.replace(hour=event_time.hour, minute=event_time.minute)
-        
-        # Create timezone objects
-        est = pytz.timezone('US/Eastern')
-        utc = pytz.UTC
-        
-        # Localize to EST and convert to UTC
-        event_datetime_est = est.localize(event_datetime)
-        event_datetime_utc = event_datetime_est.astimezone(utc)
-        
-        # Return as naive datetime for comparison
-        return event_datetime_utc.replace(tzinfo=None)
-        
-    except Exception as e:
-        logger.error(f"Error converting EST to UTC: {e}")
-        return None
-
-
-def convert_start_time_utc(est_time_str: str) -> str:
-    """
-    Convert a time string in 'YYYY-MM-DD HH:MM' format from Eastern Time (handling DST)
-    to UTC in ISO 8601 format.
-    """
-
-    # Parse the input string to a naive datetime object
-    local_time = datetime.strptime(est_time_str, '%Y-%m-%d %H:%M')
-
-    # Attach Eastern Time zone info
-    eastern_time = local_time.replace(tzinfo=ZoneInfo("America/New_York"))
+# Output fields left exactly as assembled by normalize_text_case
+TEXT_CASE_SKIP_KEYS = frozenset({"time", "channel", "track_location"})
+KNOWN_ACRONYMS = frozenset({"NASCAR", "CARS", "ARCA", "PLM"})  # add more acronyms here as needed
 
-    # Convert to UTC
-    utc_time = eastern_time.astimezone(ZoneInfo("UTC"))
+# Mapping of direction words to abbreviations
+WIND_DIRECTION_ABBREVIATIONS = {
+    "North": "N",
+    "South": "S",
+    "East": "E",
+    "West": "W",
+    "Northeast": "NE",
+    "Northwest": "NW",
+    "Southeast": "SE",
+    "Southwest": "SW",
+}
 
-    # Return in the desired ISO 8601 format with 'Z'
-    return utc_time.strftime('%Y-%m-%dT%H:%M:%SZ')
-
-
-
-def parse_event_time(event_time_str: str):
-    """Parse event time string into a standardized format."""
-    event_time_str = event_time_str.strip().lower()
-    if ':' not in event_time_str:
-        event_time_str = event_time_str.replace(' am', ':00 AM').replace(' pm', ':00 PM')
-    else:
-        event_time_str = event_time_str.upper()
 
-    return event_time_str
+@lru_cache(maxsize=4096)
+def normalize_text(s: str) -> str:
+    """Title-case a string keeping known acronyms in uppercase, memoized since series and condition strings repeat."""
+    if s.strip().upper() == "INDYCAR SERIES":
+        return "IndyCar Series"
 
-
-def parse_datetime(date_str, time_str):
-    """Turn event date and time e.g. 2PM into single datetime value"""
-    dt_str = f"{date_str} {time_str}"
-    formats = ["%Y-%m-%d %I %p", "%Y-%m-%d %I:%M %p"]
-    for fmt in formats:
-        try:
-            return datetime.strptime(dt_str, fmt)
-        except ValueError:
-            continue
-    raise ValueError(f"Date/time format not recognized: {dt_str}")
+    return " ".join(word.upper() if word.upper() in KNOWN_ACRONYMS else word.title() for word in s.split())
 
 
 def normalize_text_case(data):
     """Normalize text case in JSON structure, preserve known acronyms in uppercase"""
-    
-    skip_keys = {"time", "channel", "track_location"}
-    known_acronyms = {"NASCAR", "CARS", "ARCA", "PLM"}  # add more acronyms here as needed
-    
-    def normalize_string(s):
-        if s.strip().upper() == "INDYCAR SERIES":
-            return "IndyCar Series"
-        
-        words = s.split()
-        normalized_words = []
-        for word in words:
-            if word.upper() in known_acronyms:
-                normalized_words.append(word.upper())
-            else:
-                normalized_words.append(word.title())
-        return " ".join(normalized_words)
-    
     if isinstance(data, dict):
         return {
-            key: value if key in skip_keys else normalize_text_case(value)
+            key: value if key in TEXT_CASE_SKIP_KEYS else normalize_text_case(value)
             for key, value in data.items()
         }
     elif isinstance(data, list):
         return [normalize_text_case(item) for item in data]
     elif isinstance(data, str):
-        return normalize_string(data)
+        return normalize_text(data)
     else:
         return data  # Leave numbers, bools, None unchanged
 
@@ -133,21 +73,9 @@ def convert_wind_direction(direction):
     if not isinstance(direction, str):
         return direction
 
-    # Mapping of direction words to abbreviations
-    direction_map = {
-        "North": "N",
-        "South": "S",
-        "East": "E",
-        "West": "W",
-        "Northeast": "NE",
-        "Northwest": "NW",
-        "Southeast": "SE",
-        "Southwest": "SW",
-    }
-
     # Split the direction if it's compound (e.g. "North_Northwest")
     parts = direction.split("_")
-    abbreviated_parts = [direction_map.get(part, part) for part in parts]
+    abbreviated_parts = [WIND_DIRECTION_ABBREVIATIONS.get(part, part) for part in parts]
 
     # Join with space for clarity (e.g. "N NW")
     return " ".join(abbreviated_parts)
@@ -164,3 +92,70 @@ def normalize_wind_directions(data):
         return [normalize_wind_directions(item) for item in data]
     else:
         return data
+
+
+@lru_cache(maxsize=256)
+def normalize_wind_text(direction: str) -> str:
+    """Text case then abbreviate an API wind direction, e.g. NORTH_NORTHWEST to N NW."""
+    return convert_wind_direction(normalize_text(direction))
+
+
+def normalize_event(event):
+    """
+    Normalize an assembled event in place in one pass, same output as normalize_text_case
+    followed by normalize_wind_directions but without copying the event tree.
+    """
+    return _normalize_record(event, EVENT_SCHEMA)
+
+
+def _keep(value):
+    return value
+
+
+def _normalize_value(value):
+    """Default field rule, strings are text-cased and unexpected nested data gets the generic treatment."""
+    if isinstance(value, str):
+        return normalize_text(value)
+    if isinstance(value, (dict, list)):
+        return normalize_wind_directions(normalize_text_case(value))
+    return value
+
+
+def _normalize_wind_value(value):
+    if isinstance(value, str):
+        return normalize_wind_text(value)
+    return normalize_text_case(value)
+
+
+def _normalize_record(record, schema):
+    """Apply each field's rule from schema (default _normalize_value) to a dict in place."""
+    if not isinstance(record, dict):
+        return _normalize_value(record)
+    for key, value in record.items():
+        record[key] = schema.get(key, _normalize_value)(value)
+    return record
+
+
+def _normalize_records(records, schema):
+    """Apply _normalize_record to every item of a list in place."""
+    if not isinstance(records, list):
+        return _normalize_value(records)
+    for i, record in enumerate(records):
+        records[i] = _normalize_record(record, schema)
+    return records
+
+
+# Per-field rules for the events_with_weather output, fields not listed use _normalize_value
+HOURLY_FORECAST_SCHEMA = {
+    'time': _keep,
+    'wind_speed_direction': _normalize_wind_value,
+}
+WEATHER_SCHEMA = {
+    'hourly_forecast': lambda hourly_forecast: _normalize_records(hourly_forecast, HOURLY_FORECAST_SCHEMA),
+}
+EVENT_SCHEMA = {
+    'time': _keep,
+    'channel': _keep,
+    'track_location': _keep,
+    'weather': lambda weather: _normalize_record(weather, WEATHER_SCHEMA),
+}
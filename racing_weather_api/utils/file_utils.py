@@ -1,9 +1,16 @@
 """
 Utility functions for file operations and JSON handling.
 """
+import gzip
 import json
 import os
 import logging
+import tempfile
+
+try:
+    import brotli
+except ImportError:  # Optional, only needed for .br siblings of published files
+    brotli = None
 
 logger = logging.getLogger(__name__)
 
@@ -30,3 +37,51 @@ def save_json(data, file_path: str):
     except Exception as e:
         logger.error(f"Error saving data: {e}")
         return False
+
+
+def publish_json(data, file_path: str, compress=()):
+    """Publish a JSON file served by the web server: compact, atomic, with optional pre-compressed siblings.
+
+    Args:
+        compress: Sibling formats to write next to the file, any of 'gz' and 'br' (br needs the brotli package).
+    """
+    # Ensure the directory exists
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+    try:
+        payload = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        _write_atomic(file_path, payload)
+
+        for fmt in compress:
+            if fmt == 'gz':
+                _write_atomic(f"{file_path}.gz", gzip.compress(payload, compresslevel=9, mtime=0))
+            elif fmt == 'br':
+                if brotli is None:
+                    logger.warning(f"brotli is not installed, skipping {file_path}.br")
+                    continue
+                _write_atomic(f"{file_path}.br", brotli.compress(payload))
+            else:
+                logger.warning(f"Unknown compression format '{fmt}' for {file_path}")
+
+        logger.info(f"Published {len(payload)} bytes to {file_path}")
+        return True
+    except Exception as e:
+        logger.error(f"Error publishing data: {e}")
+        return False
+
+
+def _write_atomic(file_path: str, payload: bytes):
+    """Write bytes to a temp file in the target directory, fsync it and rename it over the target."""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates files as 0600, published files must stay readable by the web server
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
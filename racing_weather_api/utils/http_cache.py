@@ -0,0 +1,125 @@
+"""
+Validator cache for conditional requests.
+
+Records the ETag/Last-Modified and body of each response by URL so the next request can send
+If-None-Match/If-Modified-Since, and a 304 Not Modified is answered from the saved body.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import urllib.parse
+from racing_weather_api.config import HTTP_CACHE_DIR, HTTP_CACHE_MAX_ENTRIES, HTTP_CACHE_IGNORED_PARAMS
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE_NAME = 'index.json'
+
+
+class ValidatorCache:
+    """Saved validators and bodies by URL, with hit (304) and miss (full response) counters for the current run."""
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR, max_entries=HTTP_CACHE_MAX_ENTRIES,
+                 ignored_params=HTTP_CACHE_IGNORED_PARAMS):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.ignored_params = set(ignored_params)
+        self.hits = 0
+        self.misses = 0
+        self._index = None
+        self._lock = threading.Lock()
+
+    def cache_key(self, url):
+        """URL with ignored query parameters (API keys) removed, so secrets never reach the index."""
+        parts = urllib.parse.urlsplit(url)
+        query = [(name, value) for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+                 if name not in self.ignored_params]
+        return urllib.parse.urlunsplit(parts._replace(query=urllib.parse.urlencode(query)))
+
+    def request_headers(self, url):
+        """Conditional request headers for url, empty if nothing usable is saved for it."""
+        with self._lock:
+            entry = self._load_index().get(self.cache_key(url))
+            if not entry or not os.path.exists(os.path.join(self.cache_dir, entry['file'])):
+                return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def not_modified_body(self, url):
+        """Saved body for a 304 response to url counted as a cache hit, None if it was evicted meanwhile."""
+        with self._lock:
+            entry = self._load_index().get(self.cache_key(url))
+            try:
+                with open(os.path.join(self.cache_dir, entry['file']), 'rb') as f:
+                    body = f.read()
+            except (TypeError, FileNotFoundError):
+                logger.warning(f"Saved response for {self.cache_key(url)} is missing, requesting it again")
+                return None
+            self.hits += 1
+            return body
+
+    def store_response(self, url, headers, body):
+        """Save the validators and body of a full response to url, counted as a cache miss."""
+        etag, last_modified = headers.get('ETag'), headers.get('Last-Modified')
+        with self._lock:
+            self.misses += 1
+            if not etag and not last_modified:
+                return
+
+            key = self.cache_key(url)
+            file_name = f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.body"
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._write_file(os.path.join(self.cache_dir, file_name), body)
+
+            index = self._load_index()
+            index[key] = {'file': file_name, 'etag': etag, 'last_modified': last_modified, 'stored_at': time.time()}
+            self._evict()
+            self._write_file(self.index_file, json.dumps(index).encode('utf-8'))
+
+    def log_stats(self, name):
+        """Log and reset the hit/miss counters for a run."""
+        with self._lock:
+            hits, misses = self.hits, self.misses
+            self.hits = self.misses = 0
+        if hits or misses:
+            logger.info(f"{name} conditional requests: {hits} not modified (served from cache), {misses} downloaded")
+
+    @property
+    def index_file(self):
+        return os.path.join(self.cache_dir, INDEX_FILE_NAME)
+
+    def _evict(self):
+        """Drop the oldest saved responses until the cache is within max_entries."""
+        index = self._index
+        overflow = len(index) - self.max_entries
+        if overflow <= 0:
+            return
+        for key in sorted(index, key=lambda k: index[k]['stored_at'])[:overflow]:
+            entry = index.pop(key)
+            try:
+                os.remove(os.path.join(self.cache_dir, entry['file']))
+            except FileNotFoundError:
+                pass
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self.index_file, 'r') as f:
+                    self._index = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._index = {}
+        return self._index
+
+    @staticmethod
+    def _write_file(file_path, payload):
+        # Write to a temp file and rename so a crash never leaves a half-written entry
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(tmp_path, file_path)
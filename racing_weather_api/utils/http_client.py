@@ -0,0 +1,101 @@
+"""
+Shared HTTP client layer, one pooled keep-alive session per upstream host.
+"""
+import asyncio
+import logging
+import threading
+import urllib.parse
+import aiohttp
+import requests
+from requests.adapters import HTTPAdapter
+from racing_weather_api.config import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, API_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+# Pooled sessions by host (netloc), created on first use and reused for the life of the process
+sessions = {}
+sessions_lock = threading.Lock()
+
+DEFAULT_HEADERS = {
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+}
+
+
+def get_session(url):
+    """Return the shared session for the host of url, creating it on first use."""
+    host = urllib.parse.urlsplit(url).netloc
+    with sessions_lock:
+        session = sessions.get(host)
+        if session is None:
+            session = create_session()
+            sessions[host] = session
+            logger.debug(f"Created pooled HTTP session for {host}")
+        return session
+
+
+def create_session(pool_connections=HTTP_POOL_CONNECTIONS, pool_maxsize=HTTP_POOL_MAXSIZE):
+    """Create a session whose adapter keeps up to pool_maxsize idle connections open per host."""
+    session = requests.Session()
+    # Retries are handled by the callers (tenacity), so the adapter never retries on its own
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update(DEFAULT_HEADERS)
+    return session
+
+
+# Event loop of the async fetch path, runs in a background thread for the life of the process so the
+# aiohttp session below (and its connections) is reused by every refresh instead of one per asyncio.run
+event_loop = None
+event_loop_lock = threading.Lock()
+async_session = None
+
+
+def get_event_loop():
+    """Return the shared background event loop, starting it on first use."""
+    global event_loop
+    with event_loop_lock:
+        if event_loop is None:
+            event_loop = asyncio.new_event_loop()
+            threading.Thread(target=event_loop.run_forever, name="async-http", daemon=True).start()
+        return event_loop
+
+
+def run_coroutine(coro):
+    """Run a coroutine on the shared event loop and wait for its result, callable from any thread but the loop's own."""
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop()).result()
+
+
+def get_async_session():
+    """Return the shared aiohttp session, creating it on first use. Must be called on the shared event loop."""
+    global async_session
+    if async_session is None or async_session.closed:
+        async_session = create_async_session()
+        logger.debug("Created pooled aiohttp session")
+    return async_session
+
+
+def create_async_session(pool_maxsize=HTTP_POOL_MAXSIZE, timeout=API_TIMEOUT):
+    """Create an aiohttp session for the async fetch path, must be created and closed inside a running event loop."""
+    connector = aiohttp.TCPConnector(limit_per_host=pool_maxsize, keepalive_timeout=60)
+    return aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS,
+                                 timeout=aiohttp.ClientTimeout(total=timeout))
+
+
+def close_sessions():
+    """Close every pooled session and its open connections, and stop the shared event loop."""
+    global event_loop, async_session
+    with sessions_lock:
+        for session in sessions.values():
+            session.close()
+        sessions.clear()
+
+    with event_loop_lock:
+        if event_loop is None:
+            return
+        if async_session is not None:
+            asyncio.run_coroutine_threadsafe(async_session.close(), event_loop).result()
+            async_session = None
+        event_loop.call_soon_threadsafe(event_loop.stop)
+        event_loop = None
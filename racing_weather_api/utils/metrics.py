@@ -0,0 +1,143 @@
+"""
+Run metrics for the refresh jobs: stage timings, request latencies and counts, exported in the
+Prometheus textfile collector format and as a JSON run summary.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from racing_weather_api.config import METRICS_ENABLED
+
+logger = logging.getLogger(__name__)
+
+
+class RunMetrics:
+    """Values and timings recorded during one run of a job, reset at the start of every run.
+
+    Metric names are prefixed with the job name in the exported file, e.g. racing_weather_api_requests.
+    """
+
+    def __init__(self, job, textfile_dir, summary_file):
+        self.job = job
+        self.textfile_dir = textfile_dir
+        self.summary_file = summary_file
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Drop everything recorded so far and start timing a new run."""
+        with self._lock:
+            self.started_at = time.time()
+            self.values = {}
+            self.timings = {}
+
+    def increment(self, name, value=1, **labels):
+        """Add value to a count, e.g. requests made or bytes downloaded this run."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def set_value(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.values[key] = value
+
+    def observe(self, name, seconds, **labels):
+        """Record one duration, kept as count, total and max."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            count, total, longest = self.timings.get(key, (0, 0.0, 0.0))
+            self.timings[key] = (count + 1, total + seconds, max(longest, seconds))
+
+    @contextmanager
+    def stage(self, name):
+        """Time a pipeline stage, a stage that raises is also counted in stage_errors."""
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.increment('stage_errors', stage=name)
+            raise
+        finally:
+            self.observe('stage_duration_seconds', time.perf_counter() - start, stage=name)
+
+    def summary(self, success=True):
+        """The run as a JSON-serializable dict."""
+        with self._lock:
+            values = dict(self.values)
+            timings = dict(self.timings)
+        return {
+            'job': self.job,
+            'success': success,
+            'started_at': datetime.fromtimestamp(self.started_at, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'duration_seconds': round(time.time() - self.started_at, 3),
+            'stages': {dict(labels)['stage']: round(total, 3)
+                       for (name, labels), (_, total, _) in timings.items() if name == 'stage_duration_seconds'},
+            'values': [{'name': name, 'labels': dict(labels), 'value': value}
+                       for (name, labels), value in sorted(values.items())],
+            'timings': [{'name': name, 'labels': dict(labels), 'count': count,
+                         'total_seconds': round(total, 6), 'max_seconds': round(longest, 6)}
+                        for (name, labels), (count, total, longest) in sorted(timings.items())],
+        }
+
+    def to_prometheus(self, success=True):
+        """The run in the Prometheus text exposition format, values describe the last run so all are gauges."""
+        with self._lock:
+            values = dict(self.values)
+            timings = dict(self.timings)
+
+        families = {}
+        for (name, labels), value in values.items():
+            families.setdefault((name, 'gauge'), []).append(('', labels, value))
+        for (name, labels), (count, total, longest) in timings.items():
+            families.setdefault((name, 'summary'), []).extend([('_count', labels, count), ('_sum', labels, total)])
+            families.setdefault((f"{name}_max", 'gauge'), []).append(('', labels, longest))
+        families[('last_run_timestamp_seconds', 'gauge')] = [('', (), self.started_at)]
+        families[('last_run_duration_seconds', 'gauge')] = [('', (), time.time() - self.started_at)]
+        families[('last_run_success', 'gauge')] = [('', (), int(success))]
+
+        lines = []
+        for (name, metric_type), samples in sorted(families.items()):
+            metric_name = f"{self.job}_{name}"
+            lines.append(f"# TYPE {metric_name} {metric_type}")
+            for suffix, labels, value in sorted(samples):
+                lines.append(f"{metric_name}{suffix}{_format_labels(labels)} {_format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+    def write(self, success=True):
+        """Write the textfile collector file and the JSON run summary, errors are logged and never raised."""
+        if not METRICS_ENABLED:
+            return
+        try:
+            _write_atomic(os.path.join(self.textfile_dir, f"{self.job}.prom"), self.to_prometheus(success))
+            _write_atomic(self.summary_file, json.dumps(self.summary(success), indent=2))
+            logger.info(f"Wrote {self.job} run metrics to {self.textfile_dir} and {self.summary_file}")
+        except Exception as e:
+            logger.error(f"Error writing {self.job} run metrics: {e}")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape_label_value(value)}"' for key, value in labels) + '}'
+
+
+def _format_value(value):
+    # Full precision, e.g. timestamps must not be rounded to 6 significant digits
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+def _escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _write_atomic(file_path, text):
+    # The textfile collector may read at any time, so never leave a partial file in place
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    tmp_file = f"{file_path}.tmp"
+    with open(tmp_file, 'w') as f:
+        f.write(text)
+    os.replace(tmp_file, file_path)
@@ -0,0 +1,148 @@
+"""
+Client-side rate limiting and daily quota tracking for paid upstream APIs.
+"""
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+
+class QuotaExceededError(Exception):
+    """Raised when a request would go over the daily quota budget."""
+
+
+class TokenBucket:
+    """Token bucket shared by threads and the event loop, each request takes one token."""
+
+    def __init__(self, rate_per_second, capacity):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, sleeping until one is available."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """Take a token, yielding to the event loop until one is available."""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _reserve(self):
+        # Take the token now (going negative if needed) and return how long to wait for it,
+        # so concurrent callers queue up instead of all waking at once
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            return 0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class QuotaBudget:
+    """Requests made against a daily quota, persisted so every run in a day shares the budget."""
+
+    def __init__(self, daily_limit, state_file, reset_timezone='UTC'):
+        self.daily_limit = daily_limit
+        self.state_file = state_file
+        self.reset_timezone = ZoneInfo(reset_timezone)
+        self._state = None
+        self._lock = threading.Lock()
+
+    def remaining(self):
+        """Requests left in today's budget."""
+        with self._lock:
+            return max(0, self.daily_limit - self._load_state()['used'])
+
+    def consume(self, count=1):
+        """Record count requests, raising QuotaExceededError instead if they don't fit in today's budget."""
+        with self._lock:
+            state = self._load_state()
+            if state['used'] + count > self.daily_limit:
+                raise QuotaExceededError(f"Daily API quota of {self.daily_limit} requests used up for {state['day']}")
+            state['used'] += count
+            self._save_state()
+
+    def refund(self, count):
+        """Give back count requests that were reserved but not made."""
+        with self._lock:
+            state = self._load_state()
+            state['used'] = max(0, state['used'] - count)
+            self._save_state()
+
+    def reserve(self, count):
+        """Take count requests up front for a chain of requests, see QuotaReservation."""
+        return QuotaReservation(self, count)
+
+    def _today(self):
+        # Quota days follow the provider's reset time zone, not the server's
+        return datetime.now(self.reset_timezone).strftime('%Y-%m-%d')
+
+    def _load_state(self):
+        today = self._today()
+        if self._state is None:
+            try:
+                with open(self.state_file, 'r') as f:
+                    self._state = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self._state = {}
+        if self._state.get('day') != today:
+            self._state = {'day': today, 'used': 0}
+        return self._state
+
+    def _save_state(self):
+        try:
+            os.makedirs(os.path.dirname(self.state_file), exist_ok=True)
+            tmp_path = f"{self.state_file}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self._state, f)
+            os.replace(tmp_path, self.state_file)
+        except OSError as e:
+            logger.error(f"Error saving API quota state to {self.state_file}: {e}")
+
+
+class QuotaReservation:
+    """
+    Requests taken from a QuotaBudget before a chain of requests starts, so a chain is never cut
+    off halfway by the quota. Requests past the reservation are taken one at a time, unused ones
+    are refunded when the reservation is closed (use it as a context manager).
+    """
+
+    def __init__(self, budget, count):
+        budget.consume(count)
+        self.budget = budget
+        self.reserved = count
+        self.used = 0
+        self._lock = threading.Lock()
+
+    def take(self):
+        """Account for one request, raising QuotaExceededError if it is past the reservation and over budget."""
+        with self._lock:
+            self.used += 1
+            over_reservation = self.used > self.reserved
+        if over_reservation:
+            self.budget.consume()
+
+    def close(self):
+        with self._lock:
+            unused = max(0, self.reserved - self.used)
+            self.reserved -= unused
+        if unused:
+            self.budget.refund(unused)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
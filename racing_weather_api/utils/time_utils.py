@@ -0,0 +1,81 @@
+"""
+Time normalization for schedule dates and times, with cached time zones and memoized parsing.
+"""
+import re
+import logging
+from datetime import datetime, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Schedule start times are compiled manually in Eastern time
+SCHEDULE_TIMEZONE_NAME = 'America/New_York'
+
+# Schedule times such as '2 PM', '2:30 PM' or '7:30 pm'
+TIME_PATTERN = r'^\s*(\d{1,2})(?::(\d{2}))?\s*([AP]M)\s*$'
+_time_regex = re.compile(TIME_PATTERN, re.IGNORECASE)
+
+@lru_cache(maxsize=None)
+def get_timezone(name=SCHEDULE_TIMEZONE_NAME):
+    """Return the cached ZoneInfo for a time zone name."""
+    return ZoneInfo(name)
+
+
+@lru_cache(maxsize=4096)
+def parse_local_datetime(date_str: str, time_str: str) -> datetime:
+    """Parse a schedule date ('2025-06-27') and time ('2 PM', '2:30 PM') into a naive local datetime."""
+    match = _time_regex.match(time_str) if isinstance(time_str, str) else None
+    hour, minute = (int(match[1]), int(match[2] or 0)) if match else (0, -1)
+    if not 1 <= hour <= 12 or not 0 <= minute <= 59:
+        raise ValueError(f"Date/time format not recognized: {date_str} {time_str}")
+
+    hour = hour % 12 + (12 if match[3].upper() == 'PM' else 0)
+    return datetime.strptime(date_str, '%Y-%m-%d').replace(hour=hour, minute=minute)
+
+
+@lru_cache(maxsize=4096)
+def local_to_utc_epoch(date_str: str, time_str: str, tz_name=SCHEDULE_TIMEZONE_NAME):
+    """UTC epoch seconds of a local schedule date and time, or None if they can't be parsed."""
+    try:
+        local_time = parse_local_datetime(date_str, time_str)
+    except (TypeError, ValueError):
+        return None
+    return int(local_time.replace(tzinfo=get_timezone(tz_name)).timestamp())
+
+
+def local_times_to_utc_epochs(date_strs, time_strs, tz_name=SCHEDULE_TIMEZONE_NAME):
+    """
+    Convert many local schedule dates and times to UTC epoch seconds in one vectorized pass.
+
+    Returns:
+        List of epochs, None where a date or time can't be parsed. Same results as calling
+        local_to_utc_epoch for each pair.
+    """
+    dates = pd.Series(list(date_strs), dtype=object)
+    times = pd.Series(list(time_strs), dtype=object)
+    if dates.empty:
+        return []
+
+    parts = times.where(times.map(lambda value: isinstance(value, str)), '').str.extract(TIME_PATTERN, flags=re.IGNORECASE)
+    hours = pd.to_numeric(parts[0], errors='coerce')
+    minutes = pd.to_numeric(parts[1].fillna('0'), errors='coerce')
+    valid = hours.between(1, 12) & minutes.between(0, 59)
+    hours_24 = hours % 12 + (parts[2].str.upper() == 'PM') * 12
+
+    local_times = pd.to_datetime(dates, format='%Y-%m-%d', errors='coerce') + pd.to_timedelta(hours_24 * 60 + minutes, unit='m')
+    local_times = local_times.where(valid)
+
+    # Ambiguous/missing DST hours resolve like zoneinfo's fold=0 (first occurrence, offset before the gap)
+    utc_times = local_times.dt.tz_localize(get_timezone(tz_name), ambiguous=np.ones(len(local_times), dtype=bool),
+                                           nonexistent=pd.Timedelta(hours=1))
+    seconds = (utc_times - pd.Timestamp(0, tz='UTC')) // pd.Timedelta(seconds=1)
+
+    return [None if pd.isna(value) else int(value) for value in seconds]
+
+
+def utc_datetime(epoch) -> datetime:
+    """Naive UTC datetime for an epoch, the form the forecast window calculations compare against."""
+    return datetime.fromtimestamp(epoch, timezone.utc).replace(tzinfo=None)
@@ -1,14 +1,14 @@
+import sys
 import logging
-from racing_weather_api.config import LOG_FILE, LOG_LEVEL, LOG_FORMAT
-from wilson_ave_river_data_api.river_data_updater import update_wilson_ave_river_data
+from wilson_ave_river_data_api.river_data_updater import LOG_FILE, update_wilson_ave_river_data
 
 # Configure logging
 logging.basicConfig(
-    level=getattr(logging, LOG_LEVEL),
-    format=LOG_FORMAT,
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
     handlers=[
         logging.FileHandler(LOG_FILE),
-        logging.StreamHandler()  # Enable for production deployment
+        logging.StreamHandler(sys.stdout)
     ]
 )
 logger = logging.getLogger(__name__)
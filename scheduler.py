@@ -0,0 +1,106 @@
+"""
+Long-running scheduler that replaces the cron entries for main.py and river_data_updater.py.
+
+Runs the weather refresh and the river update on independent intervals in one resident process,
+so the imports, .env, track registry, forecast caches and HTTP sessions stay warm between runs.
+"""
+import logging
+import random
+import signal
+import threading
+from racing_weather_api.config import (LOG_FILE, LOG_LEVEL, LOG_FORMAT, WEATHER_REFRESH_INTERVAL_SECONDS,
+                                       RIVER_UPDATE_INTERVAL_SECONDS, SCHEDULER_JITTER_SECONDS)
+from racing_weather_api.data_processing.event_processing import get_events_with_weather
+from racing_weather_api.utils.http_client import close_sessions
+from wilson_ave_river_data_api.river_data_updater import update_wilson_ave_river_data
+
+# Configure logging
+logging.basicConfig(
+    level=getattr(logging, LOG_LEVEL),
+    format=LOG_FORMAT,
+    handlers=[
+        logging.FileHandler(LOG_FILE),
+        logging.StreamHandler()  # Enable for production deployment
+    ]
+)
+logger = logging.getLogger(__name__)
+
+# Set on SIGTERM/SIGINT, wakes every job loop so the process can exit
+shutdown_event = threading.Event()
+
+
+def refresh_weather():
+    """Weather refresh job, same work as main.py."""
+    events = get_events_with_weather(use_cached=False)
+    if events:
+        logger.info(f"Processed {len(events)} events for the current weekend")
+    else:
+        logger.warning("No events found for the current weekend")
+
+
+class ScheduledJob:
+    """Runs a function every interval_seconds (plus random jitter) on its own thread, never overlapping itself."""
+
+    def __init__(self, name, func, interval_seconds, jitter_seconds=SCHEDULER_JITTER_SECONDS):
+        self.name = name
+        self.func = func
+        self.interval_seconds = interval_seconds
+        self.jitter_seconds = jitter_seconds
+        self._running = threading.Lock()
+        self.thread = threading.Thread(target=self._loop, name=name)
+
+    def start(self):
+        self.thread.start()
+
+    def run_once(self):
+        """Run the job unless a previous run is still in progress."""
+        if not self._running.acquire(blocking=False):
+            logger.warning(f"Skipping {self.name}, previous run is still in progress")
+            return
+        try:
+            logger.info(f"Starting {self.name}")
+            self.func()
+        except Exception as e:
+            logger.error(f"Error in scheduled job {self.name}: {str(e)}")
+        finally:
+            self._running.release()
+
+    def _loop(self):
+        # Start with a jittered delay so both jobs don't hit the network at the same moment
+        delay = random.uniform(0, self.jitter_seconds)
+        while not shutdown_event.wait(delay):
+            self.run_once()
+            delay = self.interval_seconds + random.uniform(0, self.jitter_seconds)
+
+
+def handle_shutdown(signum, frame):
+    logger.info(f"Received signal {signum}, shutting down after in-flight jobs finish")
+    shutdown_event.set()
+
+
+def main():
+    signal.signal(signal.SIGTERM, handle_shutdown)
+    signal.signal(signal.SIGINT, handle_shutdown)
+
+    jobs = [
+        ScheduledJob("weather refresh", refresh_weather, WEATHER_REFRESH_INTERVAL_SECONDS),
+        ScheduledJob("river update", update_wilson_ave_river_data, RIVER_UPDATE_INTERVAL_SECONDS),
+    ]
+    for job in jobs:
+        job.start()
+    logger.info(f"Scheduler started: weather every {WEATHER_REFRESH_INTERVAL_SECONDS}s, "
+                f"river every {RIVER_UPDATE_INTERVAL_SECONDS}s")
+
+    # Wait on the event rather than join() so signals are handled promptly in the main thread
+    while not shutdown_event.wait(1):
+        pass
+    for job in jobs:
+        job.thread.join()
+
+    # Jobs are done, release the pooled keep-alive connections
+    close_sessions()
+    logger.info("Scheduler stopped")
+
+
+if __name__ == "__main__":
+    main()
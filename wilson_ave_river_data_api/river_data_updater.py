@@ -1,9 +1,16 @@
 import os
-import sys
+import time
 import logging
 from datetime import datetime, timedelta
 import pandas as pd
 import requests
+from racing_weather_api.utils.http_client import get_session
+from racing_weather_api.config import METRICS_TEXTFILE_DIR
+from racing_weather_api.utils.http_cache import ValidatorCache
+from racing_weather_api.utils.metrics import RunMetrics
+from wilson_ave_river_data_api.river_history import (site_key, has_history, write_river_history,
+                                                     import_csv_history, last_reading_time, update_river_csv,
+                                                     qualifier_column)
 
 # configuration settings
 ###########################################
@@ -14,10 +21,22 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Data files with updated paths
 STATION_LIST_FILE = os.path.join(BASE_DIR, 'data', 'station_list_mi.csv')
-RIVER_DATA_FILE = os.path.join(BASE_DIR, 'data', 'river_level_data.rdb')
+# Log file of the river_data_updater.py entry script, importing this module configures no logging
 LOG_FILE = os.path.join(BASE_DIR, 'log_file.log')
 DATA_OUTPUT_DIR = os.path.join('/', 'var', 'www', 'html', 'data')
 DATA_OUTPUT_FILE = os.path.join(DATA_OUTPUT_DIR, 'river_data_m-11.csv')
+# Saved ETag/Last-Modified validators and bodies of USGS responses, for conditional requests
+HTTP_CACHE_DIR = os.path.join(BASE_DIR, 'data', 'http_cache')
+# JSON summary of the last run (stage timings, request counts), the Prometheus textfile goes to METRICS_TEXTFILE_DIR
+RUN_SUMMARY_FILE = os.path.join(DATA_OUTPUT_DIR, 'river_data_run_summary.json')
+
+###########################################
+# Station Settings
+###########################################
+# Wilson Ave gauge, always monitored even if missing from the station list
+WILSON_AVE_STATION_ID = "04119070"
+# Served CSV export for each site, other stations are only kept in the history store
+SERVED_CSV_FILES = {WILSON_AVE_STATION_ID: DATA_OUTPUT_FILE}
 
 ###########################################
 # USGS API Settings
@@ -32,181 +51,291 @@ USGS_AGENCY_CODE = "USGS"
 TIMEZONE_OFFSET = "-04:00"
 # Request timeout in seconds
 API_TIMEOUT = 10
+# Max number of sites per request, NWIS accepts a comma-separated sites= list
+USGS_SITES_PER_REQUEST = 50
+
+###########################################
+# Fetch Window Settings
+###########################################
+# Window for sites with no stored readings yet
+INITIAL_FETCH_HOURS = 6
+# Re-fetch this much before the last stored reading to pick up revised values (P -> A)
+REVISION_OVERLAP_HOURS = 2
+# Furthest back a catch-up after downtime will go
+MAX_BACKFILL_DAYS = 30
+# Long catch-up windows are split into requests of at most this many hours
+BACKFILL_CHUNK_HOURS = 24 * 7
 
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
 logger = logging.getLogger(__name__)
 
+validator_cache = ValidatorCache(HTTP_CACHE_DIR)
 
+# Stage timings and request counts of the current update, written out at the end of each run
+run_metrics = RunMetrics('river_data', METRICS_TEXTFILE_DIR, RUN_SUMMARY_FILE)
 
-def load_rdb_file_to_df(input_file: str) -> pd.DataFrame:
-    """
-    Loads an RDB file into a pandas DataFrame.
-    
-    Args:
-        input_file (str): Path to the RDB file.
-    
-    Returns:
-        data: DataFrame containing the RDB data.
-    """
-    try:
-        if not os.path.exists(input_file):
-            raise FileNotFoundError(f"File not found: {input_file}")
-    
-        # Read the downloaded RDB file, skipping comment lines
-        data = pd.read_csv(input_file,
-                            comment='#',
-                            sep='\t',
-                            skiprows=[0],  # Skip the first non-comment line (format spec)
-                            dtype={'agency_cd': str, 'site_no': str})
-
-        # Clean column names (remove any whitespace)
-        data.columns = data.columns.str.strip()
-        data = data.rename(columns={data.columns[4]: 'level'})
-        data = data.astype({'level': float}, errors='ignore')
-
-        # Convert datetime column to proper datetime objects
-        data['datetime'] = pd.to_datetime(data['datetime'])
-
-        return data
-    
-    except Exception as e:
-        logger.error(f"Error loading RDB file {input_file}: {e}")
-        raise e
-    
-
-def create_url(start_dt: datetime, end_dt: datetime, site: str, parameter: str = USGS_DEFAULT_PARAMETER_CODE) -> str:
-    """Create formatted URL for data request (adapted from your codebase)."""
-    start_str = start_dt.strftime(f"%Y-%m-%dT%H:%M:%S.000{TIMEZONE_OFFSET}")
-    end_str = end_dt.strftime(f"%Y-%m-%dT%H:%M:%S.000{TIMEZONE_OFFSET}")
-    return (f"{USGS_BASE_URL}?sites={site}&agencyCd={USGS_AGENCY_CODE}&parameterCd={parameter}"
-            f"&startDT={start_str}&endDT={end_str}&format=rdb")
 
+def parse_rdb_stream(lines, parameter: str = USGS_DEFAULT_PARAMETER_CODE):
+    """
+    Parse RDB lines incrementally into typed readings, one dict per data row.
 
-def fetch_and_save_recent_data(station_id: str, hours: int = 1) -> bool:
+    Handles multi-site responses: every site block has its own header with site-specific
+    column names (e.g. 274049_00065 / 274049_00065_cd) followed by a format spec line (5s 15s ...).
+    The value column is returned as 'level', the qualifier column keeps its RDB name.
     """
-    Fetch the last hour of data from the USGS API, check if it's not empty,
-    and save to RIVER_DATA_FILE if valid. Returns True if data was saved successfully.
-    Adapted from download_data_single_block in your codebase.
+    columns = None
+    skip_format_line = False
+
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if not line.strip() or line.startswith('#'):
+            continue
+
+        fields = line.rstrip('\r\n').split('\t')
+        if fields[0] == 'agency_cd':
+            # New site block, map the site-specific value and qualifier columns by suffix
+            header = [name.strip() for name in fields]
+            value_col = next((i for i, name in enumerate(header) if name.endswith(f"_{parameter}")), 4)
+            qualifier_col = next((i for i, name in enumerate(header) if name.endswith(f"_{parameter}_cd")), 5)
+            columns = {
+                'agency_cd': header.index('agency_cd'),
+                'site_no': header.index('site_no'),
+                'datetime': header.index('datetime'),
+                'tz_cd': header.index('tz_cd'),
+                'level': value_col,
+                header[qualifier_col] if qualifier_col < len(header) else 'qualifier': qualifier_col,
+            }
+            skip_format_line = True
+            continue
+
+        if skip_format_line:
+            skip_format_line = False
+            continue
+
+        if columns is None or len(fields) < len(columns):
+            continue
+
+        reading = {name: fields[i] for name, i in columns.items()}
+        try:
+            reading['datetime'] = datetime.strptime(reading['datetime'], '%Y-%m-%d %H:%M')
+        except ValueError:
+            logger.warning(f"Skipping RDB row with invalid datetime: {line}")
+            continue
+        try:
+            reading['level'] = float(reading['level'])
+        except ValueError:
+            reading['level'] = float('nan')  # e.g. Eqp, Ice or blank readings
+        yield reading
+
+
+def create_url(start_dt: datetime, end_dt, sites, parameter: str = USGS_DEFAULT_PARAMETER_CODE) -> str:
     """
-    current_time = datetime.now()
-    start_time = current_time - timedelta(hours=hours)
-    url = create_url(start_time, current_time, station_id)
+    Create formatted URL for data request, sites can be a single site or a list of sites.
+    An end_dt of None leaves the window open up to now, so the URL stays the same (and can be
+    revalidated) until a new reading is stored.
+    """
+    if not isinstance(sites, str):
+        sites = ','.join(sites)
+    start_str = start_dt.strftime(f"%Y-%m-%dT%H:%M:%S.000{TIMEZONE_OFFSET}")
+    url = (f"{USGS_BASE_URL}?sites={sites}&agencyCd={USGS_AGENCY_CODE}&parameterCd={parameter}"
+           f"&startDT={start_str}")
+    if end_dt is not None:
+        url += f"&endDT={end_dt.strftime(f'%Y-%m-%dT%H:%M:%S.000{TIMEZONE_OFFSET}')}"
+    return f"{url}&format=rdb"
+
+
+def load_station_list(station_list_file: str = STATION_LIST_FILE) -> list:
+    """Load the site numbers to monitor from the station list CSV (site_no column, or the first column)."""
+    stations = []
+    if os.path.exists(station_list_file):
+        try:
+            station_df = pd.read_csv(station_list_file, dtype=str)
+            column = 'site_no' if 'site_no' in station_df.columns else station_df.columns[0]
+            stations = [site_key(site) for site in station_df[column].dropna()]
+        except Exception as e:
+            logger.error(f"Error loading station list {station_list_file}: {e}")
+    else:
+        logger.info(f"Station list {station_list_file} not found, monitoring Wilson Ave only")
 
-    try:
-        # Fetch data with timeout (using config value)
-        response = requests.get(url, timeout=API_TIMEOUT)
-        response.raise_for_status()
-
-        # Process the RDB response line by line (filtering as in your download_data_single_block)
-        lines = response.text.split('\n')
-        data_to_write = []
-        header_written = False
-        has_valid_data = False
-
-        for line in lines:
-            if not line.strip():
-                continue
-            if line.startswith('agency_cd') and not header_written:
-                data_to_write.append(line)
-                header_written = True
-            elif line.startswith('USGS'):
-                data_to_write.append(line)
-                has_valid_data = True  # Mark that we have at least one data row
-
-        if not has_valid_data:
-            logger.warning("API response is empty or contains no valid data lines. Skipping save.")
-            return False
-
-        # Create directory for RIVER_DATA_FILE if it doesn't exist
-        os.makedirs(os.path.dirname(RIVER_DATA_FILE), exist_ok=True)
-
-        # Write processed data to RIVER_DATA_FILE
-        with open(RIVER_DATA_FILE, 'w') as f:
-            f.write("# USGS River Level Data\n")
-            if data_to_write:
-                f.write('\n'.join(data_to_write) + '\n')
-
-        logger.info(f"Successfully fetched and saved data to {RIVER_DATA_FILE} from {url}")
-        return True
-
-    except requests.exceptions.HTTPError as http_err:
-        logger.error(f"HTTP error occurred: {http_err}")
-        return False
-    except requests.exceptions.RequestException as req_err:
-        logger.error(f"Request error occurred: {req_err}")
-        return False
-    except Exception as e:
-        logger.error(f"Error fetching or saving data: {str(e)}")
-        return False
+    if WILSON_AVE_STATION_ID not in stations:
+        stations.insert(0, WILSON_AVE_STATION_ID)
+    return list(dict.fromkeys(stations))
 
 
-def append_to_csv(csv_file: str):
-    """Load existing CSV and RDB file, combine them, and save back to CSV."""
-    # Load the new data from RIVER_DATA_FILE
-    try:
-        new_df = load_rdb_file_to_df(RIVER_DATA_FILE)
-        if new_df.empty:
-            logger.warning(f"{RIVER_DATA_FILE} loaded but is empty. Skipping append.")
-            return
-        logger.info(f"Loaded {len(new_df)} rows from {RIVER_DATA_FILE}")
-    except Exception as e:
-        logger.error(f"Error loading {RIVER_DATA_FILE}: {str(e)}. Skipping append.")
-        return
+def plan_fetch_windows(station_ids, current_time: datetime, sites_per_request: int = USGS_SITES_PER_REQUEST) -> list:
+    """
+    Work out the requests needed to bring every site up to date.
+
+    Each site starts REVISION_OVERLAP_HOURS before its last stored reading (INITIAL_FETCH_HOURS back
+    if it has none), bounded by MAX_BACKFILL_DAYS. Sites with similar start times are batched together
+    and long windows are split into BACKFILL_CHUNK_HOURS chunks.
 
-    # Load the existing CSV or initialize if it doesn't exist
-    if not os.path.exists(csv_file):
-        logger.info(f"CSV file does not exist: {csv_file}. Creating new file from RDB data.")
-        new_df.to_csv(csv_file, index=False)
-        return
+    Returns:
+        List of (sites, start_time, end_time) requests, the last chunk of each batch has an
+        end_time of None (open up to now).
+    """
+    earliest_start = current_time - timedelta(days=MAX_BACKFILL_DAYS)
+    site_starts = {}
+    for site in station_ids:
+        last_reading = last_reading_time(site)
+        if last_reading is None:
+            start_time = current_time - timedelta(hours=INITIAL_FETCH_HOURS)
+        else:
+            start_time = last_reading - timedelta(hours=REVISION_OVERLAP_HOURS)
+        site_starts[site] = max(start_time, earliest_start)
+
+    # Sort by start so each batch's window is driven by sites with similar gaps
+    ordered_sites = sorted(site_starts, key=site_starts.get)
+    requests_plan = []
+    for batch_start in range(0, len(ordered_sites), sites_per_request):
+        batch = ordered_sites[batch_start:batch_start + sites_per_request]
+        chunk_start = min(site_starts[site] for site in batch)
+        while chunk_start < current_time:
+            chunk_end = min(chunk_start + timedelta(hours=BACKFILL_CHUNK_HOURS), current_time)
+            requests_plan.append((batch, chunk_start, chunk_end if chunk_end < current_time else None))
+            chunk_start = chunk_end
+    return requests_plan
+
+
+def fetch_new_data(station_ids, sites_per_request: int = USGS_SITES_PER_REQUEST) -> dict:
+    """
+    Fetch readings newer than the last stored reading for many sites from the USGS API,
+    batching sites into as few requests as possible.
+    The response is parsed as it streams in, no intermediate file is written.
 
+    Returns:
+        {site_no: DataFrame} for every site that returned at least one reading.
+    """
+    if isinstance(station_ids, str):
+        station_ids = [station_ids]
+
+    site_readings = {}
+    requests_plan = plan_fetch_windows(station_ids, datetime.now(), sites_per_request)
+    logger.info(f"Fetching {len(station_ids)} site(s) in {len(requests_plan)} request(s)")
+
+    for batch, start_time, end_time in requests_plan:
+        url = create_url(start_time, end_time, batch)
+
+        try:
+            # Fetch data with timeout (using config value), streaming the body
+            headers = validator_cache.request_headers(url)
+            request_start = time.perf_counter()
+            with get_session(url).get(url, headers=headers, timeout=API_TIMEOUT, stream=True) as response:
+                run_metrics.increment('usgs_requests', status=response.status_code)
+                not_modified_body = validator_cache.not_modified_body(url) if response.status_code == 304 else None
+                if not_modified_body is not None:
+                    # Unchanged since the last fetch, parse the saved copy
+                    lines = not_modified_body.decode('utf-8').splitlines()
+                    body_lines = None
+                else:
+                    response.raise_for_status()
+                    response.encoding = response.encoding or 'utf-8'
+                    body_lines = []
+                    lines = record_lines(response.iter_lines(decode_unicode=True), body_lines)
+
+                batch_rows = 0
+                for reading in parse_rdb_stream(lines):
+                    site_readings.setdefault(reading['site_no'], []).append(reading)
+                    batch_rows += 1
+
+                body = '\n'.join(body_lines).encode('utf-8') if body_lines is not None else not_modified_body
+                if body_lines is not None:
+                    validator_cache.store_response(url, response.headers, body)
+
+            # Latency covers the whole streamed body, parsing included
+            run_metrics.observe('usgs_request_seconds', time.perf_counter() - request_start)
+            run_metrics.increment('usgs_response_bytes', len(body))
+            run_metrics.increment('readings_fetched', batch_rows)
+
+            if not batch_rows:
+                logger.warning(f"API response for {len(batch)} site(s) contains no valid data lines.")
+                continue
+            logger.info(f"Successfully fetched {batch_rows} readings for {len(batch)} site(s) from {url}")
+
+        except requests.exceptions.HTTPError as http_err:
+            logger.error(f"HTTP error occurred: {http_err}")
+            run_metrics.increment('usgs_request_errors', error='http')
+        except requests.exceptions.RequestException as req_err:
+            logger.error(f"Request error occurred: {req_err}")
+            run_metrics.increment('usgs_request_errors', error='request')
+        except Exception as e:
+            logger.error(f"Error fetching data: {str(e)}")
+            run_metrics.increment('usgs_request_errors', error='other')
+
+    return {site: pd.DataFrame.from_records(readings) for site, readings in site_readings.items()}
+
+
+def record_lines(lines, body_lines: list):
+    """Pass lines through to the parser while keeping a copy for the validator cache."""
+    for line in lines:
+        body_lines.append(line)
+        yield line
+
+
+def import_served_csv_history():
+    """Import the existing served CSVs into the history store the first time a site is seen."""
+    for site, csv_file in SERVED_CSV_FILES.items():
+        if not has_history(site) and os.path.exists(csv_file):
+            try:
+                import_csv_history(csv_file)
+            except Exception as e:
+                logger.error(f"Error importing {csv_file} into history: {e}")
+
+
+def store_river_history(new_df: pd.DataFrame) -> bool:
+    """Merge new readings into the month-partitioned history, returns False if any site failed to store."""
+    stored = True
+    for site, site_rows in new_df.groupby(new_df['site_no'].map(site_key)):
+        try:
+            write_river_history(site, site_rows)
+        except Exception as e:
+            logger.error(f"Error storing history for site {site}: {e}")
+            stored = False
+    return stored
+
+
+def export_served_csv(site: str, new_df: pd.DataFrame):
+    """Re-export the months of a site's served CSV touched by new_df from the history."""
     try:
-        existing_df = pd.read_csv(csv_file)
-        logger.info(f"Loaded {len(existing_df)} rows from existing {csv_file}")
+        update_river_csv(site, SERVED_CSV_FILES[site], new_df['datetime'].min(),
+                         qualifier_name=qualifier_column(new_df) or 'qualifier')
     except Exception as e:
-        logger.error(f"Error reading existing CSV: {str(e)}. Treating as new file.")
-        new_df.to_csv(csv_file, index=False)
-        return
-
-    # Combine DataFrames (append without unifying columns, as per your request)
-    combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-
-    # Remove duplicates (based on site_no and datetime, keeping latest) and sort for consistency
-    if 'site_no' in combined_df.columns and 'datetime' in combined_df.columns:
-        combined_df = combined_df.drop_duplicates(subset=['site_no', 'datetime'], keep='last')
-        combined_df = combined_df.sort_values(['site_no', 'datetime'])
-
-    # Save the combined DataFrame back to CSV
-    combined_df.to_csv(csv_file, index=False)
-    logger.info(f"Appended {len(new_df)} new rows to {csv_file}. Total rows after update: {len(combined_df)}")
+        logger.error(f"Error exporting {SERVED_CSV_FILES[site]} from history: {e}")
 
 
 def update_wilson_ave_river_data():
-    # Constants for this script
-    STATION_ID = "04119070"
-    CSV_FILE = DATA_OUTPUT_FILE
-    HOURS = 6
-
-    logger.info(f"Starting data append for station {STATION_ID} (last {HOURS} hour(s)) to {CSV_FILE}")
-
-    # Fetch and save recent data to RIVER_DATA_FILE
-    data_saved = fetch_and_save_recent_data(STATION_ID, HOURS)
-
-    # If data was saved successfully, proceed to append
-    if data_saved:
-        append_to_csv(CSV_FILE)
-    else:
-        logger.warning("No valid data was saved to RIVER_DATA_FILE. Skipping append.")
-
-    logger.info("Script completed.")
-
-
-
-    
\ No newline at end of file
+    run_metrics.reset()
+    success = False
+    try:
+        # Constants for this script
+        with run_metrics.stage('station_list'):
+            STATION_IDS = load_station_list()
+
+        logger.info(f"Starting data append for {len(STATION_IDS)} station(s)")
+
+        # Import served CSVs first so their last readings drive the fetch window
+        with run_metrics.stage('history_import'):
+            import_served_csv_history()
+
+        # Fetch everything since each station's last stored reading, parsed straight into per-site readings
+        with run_metrics.stage('fetch'):
+            site_readings = fetch_new_data(STATION_IDS)
+        if not site_readings:
+            logger.warning("No valid data was fetched. Skipping append.")
+
+        # Store each site's readings in the history, served CSVs are then re-exported from it
+        for site, new_df in site_readings.items():
+            with run_metrics.stage('store_history'):
+                stored = store_river_history(new_df)
+            if stored and site in SERVED_CSV_FILES:
+                with run_metrics.stage('export_csv'):
+                    export_served_csv(site, new_df)
+
+        run_metrics.set_value('stations', len(STATION_IDS))
+        run_metrics.set_value('stations_with_readings', len(site_readings))
+        validator_cache.log_stats("USGS")
+        logger.info("Script completed.")
+        success = True
+    finally:
+        run_metrics.write(success)
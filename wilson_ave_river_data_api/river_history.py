@@ -0,0 +1,262 @@
+"""
+Month-partitioned columnar storage for river level history.
+
+Readings are stored per site and month as Parquet files (history/<site>/<YYYY-MM>.parquet)
+with typed columns, so ingestion only touches the months it writes and range queries
+only read the months they cover.
+"""
+import os
+import shutil
+import logging
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Base directory is the directory where this file is located
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RIVER_HISTORY_DIR = os.path.join(BASE_DIR, 'data', 'history')
+
+# Stored column types, datetime is local station time as int64 nanoseconds
+HISTORY_COLUMNS = ['datetime', 'tz_cd', 'level', 'qualifier']
+HISTORY_DTYPES = {'datetime': 'int64', 'tz_cd': 'category', 'level': 'float32', 'qualifier': 'category'}
+
+
+def site_key(site_no) -> str:
+    """Normalize a site number, older CSV rows lost the leading zero (4119070 vs 04119070)."""
+    return str(site_no).strip().zfill(8)
+
+
+def partition_path(site: str, month: pd.Period, history_dir: str = RIVER_HISTORY_DIR) -> str:
+    """Path of the partition holding one site's readings for one month."""
+    return os.path.join(history_dir, site_key(site), f"{month.strftime('%Y-%m')}.parquet")
+
+
+def has_history(site: str = None, history_dir: str = RIVER_HISTORY_DIR) -> bool:
+    """Return True if any partition exists for the site, or for any site if site is None."""
+    if site is None:
+        return os.path.isdir(history_dir) and any(has_history(name, history_dir) for name in os.listdir(history_dir))
+    site_dir = os.path.join(history_dir, site_key(site))
+    return os.path.isdir(site_dir) and any(name.endswith('.parquet') for name in os.listdir(site_dir))
+
+
+def last_reading_time(site: str, history_dir: str = RIVER_HISTORY_DIR):
+    """Return the datetime of the latest stored reading for the site, or None if it has no history."""
+    site_dir = os.path.join(history_dir, site_key(site))
+    if not os.path.isdir(site_dir):
+        return None
+    partitions = sorted(name for name in os.listdir(site_dir) if name.endswith('.parquet'))
+    if not partitions:
+        return None
+
+    # Partition names sort by month, only the newest one needs to be read
+    latest = pd.read_parquet(os.path.join(site_dir, partitions[-1]), columns=['datetime'])
+    if latest.empty:
+        return None
+    return pd.Timestamp(latest['datetime'].max()).to_pydatetime()
+
+
+def to_history_frame(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert readings for one site to the stored column layout.
+
+    Args:
+        data: DataFrame with datetime, tz_cd, level and a qualifier column, either named
+            'qualifier' or the site-specific RDB name such as '274049_00065_cd'.
+    """
+    if 'qualifier' not in data.columns:
+        data = data.rename(columns={qualifier_column(data): 'qualifier'})
+
+    history = pd.DataFrame({
+        'datetime': pd.to_datetime(data['datetime']).astype('datetime64[ns]').astype('int64'),
+        'tz_cd': data['tz_cd'],
+        'level': pd.to_numeric(data['level'], errors='coerce'),
+        'qualifier': data['qualifier'],
+    })
+    return history.astype(HISTORY_DTYPES)
+
+
+def write_river_history(site: str, data: pd.DataFrame, history_dir: str = RIVER_HISTORY_DIR) -> int:
+    """
+    Merge readings for one site into its month partitions, newer readings replace stored ones.
+
+    Returns:
+        Number of rows in the partitions that were rewritten.
+    """
+    history = to_history_frame(data)
+    if history.empty:
+        return 0
+
+    months = pd.to_datetime(history['datetime']).dt.to_period('M')
+    rows_written = 0
+    for month, month_rows in history.groupby(months.values):
+        file_path = partition_path(site, month, history_dir)
+        if os.path.exists(file_path):
+            month_rows = pd.concat([pd.read_parquet(file_path), month_rows], ignore_index=True)
+
+        month_rows = (month_rows.drop_duplicates(subset=['datetime'], keep='last')
+                      .sort_values('datetime')
+                      .reset_index(drop=True)
+                      .astype(HISTORY_DTYPES))
+
+        # Write to a temp file and rename so readers never see a partial partition
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        tmp_path = f"{file_path}.tmp"
+        month_rows.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, file_path)
+        rows_written += len(month_rows)
+
+    logger.info(f"Stored {len(history)} readings for site {site_key(site)} in {months.nunique()} month partition(s)")
+    return rows_written
+
+
+def load_river_range(site: str, start, end, history_dir: str = RIVER_HISTORY_DIR) -> pd.DataFrame:
+    """
+    Load one site's readings with start <= datetime <= end, reading only the partitions in range.
+
+    Returns:
+        DataFrame with datetime (as datetime64), tz_cd, level and qualifier columns.
+    """
+    start, end = pd.Timestamp(start), pd.Timestamp(end)
+    frames = []
+    for month in pd.period_range(start.to_period('M'), end.to_period('M'), freq='M'):
+        file_path = partition_path(site, month, history_dir)
+        if os.path.exists(file_path):
+            frames.append(pd.read_parquet(file_path))
+
+    if frames:
+        history = pd.concat(frames, ignore_index=True)
+    else:
+        history = pd.DataFrame(columns=HISTORY_COLUMNS).astype(HISTORY_DTYPES)
+    history['datetime'] = history['datetime'].astype('datetime64[ns]')
+    in_range = (history['datetime'] >= start) & (history['datetime'] <= end)
+    return history[in_range].reset_index(drop=True)
+
+
+def import_csv_history(csv_file: str, history_dir: str = RIVER_HISTORY_DIR) -> int:
+    """One-time import of an existing served river CSV into month partitions."""
+    data = pd.read_csv(csv_file, dtype={'site_no': str})
+    data['datetime'] = pd.to_datetime(data['datetime'])
+    data = data.rename(columns={data.columns[5]: 'qualifier'})
+
+    imported = 0
+    for site, site_rows in data.groupby(data['site_no'].map(site_key)):
+        write_river_history(site, site_rows, history_dir)
+        imported += len(site_rows)
+    logger.info(f"Imported {imported} rows from {csv_file} into {history_dir}")
+    return imported
+
+
+def export_river_csv(site: str, csv_file: str, start=None, end=None, history_dir: str = RIVER_HISTORY_DIR,
+                     qualifier_name: str = 'qualifier') -> int:
+    """
+    Rebuild a served CSV for one site from the history partitions.
+
+    An existing CSV keeps its qualifier column name (e.g. 274049_00065_cd), qualifier_name is
+    only used for a new file.
+    """
+    site_dir = os.path.join(history_dir, site_key(site))
+    months = sorted(name[:-len('.parquet')] for name in os.listdir(site_dir) if name.endswith('.parquet'))
+    start = pd.Timestamp(start) if start is not None else pd.Timestamp(months[0])
+    end = pd.Timestamp(end) if end is not None else pd.Timestamp(months[-1]) + pd.offsets.MonthEnd(1) + pd.Timedelta(days=1)
+
+    if os.path.exists(csv_file):
+        qualifier_name = read_csv_qualifier_name(csv_file) or qualifier_name
+    export = to_export_frame(site, load_river_range(site, start, end, history_dir), qualifier_name)
+    tmp_path = f"{csv_file}.tmp"
+    export.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, csv_file)
+    logger.info(f"Exported {len(export)} rows for site {site_key(site)} to {csv_file}")
+    return len(export)
+
+
+def update_river_csv(site: str, csv_file: str, since, history_dir: str = RIVER_HISTORY_DIR,
+                     qualifier_name: str = 'qualifier') -> int:
+    """
+    Bring a served CSV up to date with the history after new readings were stored.
+
+    Every row from the start of since's month onwards is replaced with that site's partitions,
+    so only the months that can have changed are read from the history. The unchanged rows are
+    copied byte for byte into a temp file with the new tail, which then replaces the CSV, so a
+    download never sees a half-written file. The CSV is rebuilt in full if it doesn't exist yet,
+    with qualifier_name as its qualifier column.
+
+    Returns:
+        Number of rows written.
+    """
+    if not os.path.exists(csv_file):
+        return export_river_csv(site, csv_file, history_dir=history_dir, qualifier_name=qualifier_name)
+
+    start = pd.Timestamp(since).to_period('M').to_timestamp()
+    end = last_reading_time(site, history_dir)
+    if end is None:
+        logger.warning(f"No history for site {site_key(site)}, leaving {csv_file} unchanged")
+        return 0
+
+    export = to_export_frame(site, load_river_range(site, start, end, history_dir))
+    payload = export.to_csv(index=False, header=False).encode('utf-8')
+    offset = find_csv_offset(csv_file, start)
+    tmp_path = f"{csv_file}.tmp"
+    shutil.copyfile(csv_file, tmp_path)
+    with open(tmp_path, 'rb+') as f:
+        f.seek(offset)
+        f.truncate()
+        f.write(payload)
+    os.replace(tmp_path, csv_file)
+    logger.info(f"Re-exported {len(export)} rows since {start:%Y-%m} for site {site_key(site)} to {csv_file}")
+    return len(export)
+
+
+def to_export_frame(site: str, history: pd.DataFrame, qualifier_name: str = 'qualifier') -> pd.DataFrame:
+    """Convert history rows (as returned by load_river_range) to the served CSV column layout."""
+    return pd.DataFrame({
+        'agency_cd': 'USGS',
+        'site_no': site_key(site),
+        'datetime': history['datetime'],
+        'tz_cd': history['tz_cd'],
+        'level': history['level'].astype('float64').round(2),
+        qualifier_name: history['qualifier'],
+    })
+
+
+def qualifier_column(data: pd.DataFrame):
+    """Name of the site-specific RDB qualifier column of readings, e.g. 274049_00065_cd, None if there is none."""
+    return next((col for col in data.columns if col.endswith('_cd') and col not in ('agency_cd', 'tz_cd')), None)
+
+
+def read_csv_qualifier_name(csv_file: str):
+    """Qualifier column name in a served CSV's header, the front end reads it by that name."""
+    with open(csv_file, 'r') as f:
+        header = f.readline().rstrip('\r\n').split(',')
+    return header[5] if len(header) > 5 else None
+
+
+def find_csv_offset(csv_file: str, start: pd.Timestamp) -> int:
+    """Byte offset of the first row at or after start in a CSV sorted by datetime, the end of the file if there is none."""
+    with open(csv_file, 'rb') as f:
+        f.readline()  # Header
+        data_start = f.tell()
+        file_size = f.seek(0, os.SEEK_END)
+
+        # Walk back in growing steps until the first full line of the tail is older than start
+        step = 64 * 1024
+        while True:
+            offset = max(data_start, file_size - step)
+            f.seek(offset)
+            if offset > data_start:
+                f.readline()  # Skip the partial line
+                offset = f.tell()
+            tail_lines = f.read().splitlines(keepends=True)
+            if offset == data_start or (tail_lines and _row_time(tail_lines[0]) < start):
+                break
+            step *= 4
+
+    # Then forward to the first row in range
+    for line in tail_lines:
+        if line.strip() and _row_time(line) >= start:
+            break
+        offset += len(line)
+    return offset
+
+
+def _row_time(line: bytes) -> pd.Timestamp:
+    return pd.Timestamp(line.decode('utf-8').split(',')[2])